@@ -0,0 +1,80 @@
+# agents/batch_embedder.py
+
+import os
+import logging
+import numpy as np
+from agents.token_budget import truncate_to_budget
+from agents.embedding_cache import get_embedding_cache
+from agents.openai_scheduler import BATCH, scheduled_embeddings
+from agents.metrics import record
+
+logger = logging.getLogger(__name__)
+
+# The embeddings endpoint accepts up to 2048 inputs and ~300k tokens per request
+MAX_BATCH_SIZE = int(os.getenv("VC_HUNTER_EMBED_BATCH_SIZE", "256"))
+MAX_BATCH_TOKENS = int(os.getenv("VC_HUNTER_EMBED_BATCH_TOKENS", "250000"))
+MAX_INPUT_TOKENS = 7500
+
+class BatchEmbedder:
+    """
+    Collects texts from a whole pipeline stage and embeds them in as few requests as possible.
+
+    Texts are registered with add(owner, text) and embedded on flush(), which returns
+    {owner: embedding}. Cached and duplicate texts are never sent; the rest are packed
+    into requests bounded by max_batch_size inputs and max_batch_tokens tokens. Embeddings are
+    returned as float32 arrays.
+    """
+
+    def __init__(self, client, model, max_batch_size=MAX_BATCH_SIZE, max_batch_tokens=MAX_BATCH_TOKENS, priority=BATCH):
+        self.client = client
+        self.model = model
+        self.priority = priority
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.requests_made = 0
+        self._pending = []
+
+    def add(self, owner, text):
+        self._pending.append((owner, text))
+
+    def flush(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return {}
+
+        cache = get_embedding_cache()
+        unique_texts = list(dict.fromkeys(text for _, text in pending))
+        cached = cache.get_many(unique_texts, self.model)
+        vectors = {text: vec for text, vec in zip(unique_texts, cached) if vec is not None}
+
+        missing = [text for text in unique_texts if text not in vectors]
+        record("cache", "embedding", cache_hits=len(unique_texts) - len(missing), cache_misses=len(missing))
+        for batch, batch_tokens in self._make_batches(missing):
+            originals = [original for original, _ in batch]
+            embedded = self._embed_batch([truncated for _, truncated in batch], batch_tokens)
+            cache.put_many(originals, self.model, embedded)
+            vectors.update(zip(originals, embedded))
+
+        logger.info(
+            f"[Batch Embedder] {len(pending)} texts, {len(unique_texts) - len(missing)} cached, "
+            f"{len(missing)} embedded in {self.requests_made} request(s) so far"
+        )
+        return {owner: np.asarray(vectors[text], dtype=np.float32) for owner, text in pending}
+
+    def _make_batches(self, texts):
+        batch, batch_tokens = [], 0
+        for text in texts:
+            truncated, tokens = truncate_to_budget(text, MAX_INPUT_TOKENS)
+            if batch and (len(batch) >= self.max_batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                yield batch, batch_tokens
+                batch, batch_tokens = [], 0
+            batch.append((text, truncated))
+            batch_tokens += tokens
+        if batch:
+            yield batch, batch_tokens
+
+    def _embed_batch(self, inputs, tokens):
+        response = scheduled_embeddings(self.client, self.model, inputs, tokens=tokens, priority=self.priority)
+        self.requests_made += 1
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in ordered]
@@ -0,0 +1,189 @@
+# agents/batch_matcher.py
+#
+# Batch matching of many founder documents against one warm VC corpus, for triaging a folder of
+# decks without the Streamlit app.
+#
+#   python -m agents.batch_matcher decks/ --out matches.jsonl [--corpus vc_corpus] [--top-k 25]
+#   python -m agents.batch_matcher decks/ --out matches.parquet
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from agents.vc_corpus import CORPUS_DIR, load_corpus
+from agents.embedding_store import EmbeddingMatrix
+from agents.vc_matcher import VCMatcher
+from agents.portfolio_index import PortfolioIndex
+from agents.document_ingest import extract_document_text
+from agents.batch_embedder import BatchEmbedder
+from agents.openai_client import get_client
+from agents.openai_scheduler import BATCH
+from agents.llm_embed_gap_match_chat import EMBED_MODEL, summarize_founder, match_founders_to_vcs, analyze_gap
+from agents.concurrent_vc_processor import LLM_WORKERS
+from agents.metrics import Metrics, run_scope, span, bind
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_EXTENSIONS = (".pdf", ".docx", ".txt", ".md")
+MATCHES_TOP_K = 25
+SIMILAR_COMPANIES_TOP_K = 20
+
+class WarmCorpus:
+    """The VC corpus with its matcher and portfolio index, loaded once and shared by every document."""
+
+    def __init__(self, corpus):
+        self.version = corpus["version"]
+        self.vc_embeddings = EmbeddingMatrix.from_vc_records(corpus["records"])
+        self.matcher = VCMatcher(self.vc_embeddings)
+        self.vc_summaries = [vc.summary for vc in self.vc_embeddings]
+        self.portfolio_index = corpus.get("portfolio_index") or PortfolioIndex.from_vc_embeddings(self.vc_embeddings)
+
+    @classmethod
+    def load(cls, corpus_dir=CORPUS_DIR):
+        corpus = load_corpus(corpus_dir)
+        if corpus is None:
+            return None
+        return cls(corpus)
+
+def find_documents(directory):
+    """Founder documents directly inside directory, sorted by name."""
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.startswith(".") or not os.path.isfile(path):
+            continue
+        if name.lower().endswith(DOCUMENT_EXTENSIONS):
+            paths.append(path)
+        else:
+            logger.info(f"[Batch] Skipping {name}, not a supported document type")
+    return paths
+
+def summarize_document(path):
+    """Reads, extracts and summarizes one document; returns (document hash, summary)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    with span("stage", "extract_document", bytes=len(data)):
+        text = extract_document_text(data)
+    with span("stage", "founder_summary"):
+        summary = summarize_founder(text, priority=BATCH)
+    return hashlib.sha256(data).hexdigest(), summary
+
+def match_documents(paths, warm, workers=None, top_k=MATCHES_TOP_K, similar_top_k=SIMILAR_COMPANIES_TOP_K, gap=False):
+    """
+    Matches every founder document in paths against the warm corpus.
+
+    Summaries are produced by a worker pool (identical documents share one summary through the
+    completion cache), all founder summaries are embedded in batched requests, and every founder
+    is scored against every VC and portfolio company with one matrix product each.
+
+    Returns:
+        list of dicts, one per path in input order: 'document', 'document_hash', 'founder_summary',
+        'matches', 'similar_companies', 'gap' (when requested) and 'error' (None on success).
+    """
+    results = [
+        {"document": path, "document_hash": None, "founder_summary": None, "matches": [], "similar_companies": [], "error": None}
+        for path in paths
+    ]
+    with ThreadPoolExecutor(max_workers=workers or LLM_WORKERS, thread_name_prefix="batch") as pool:
+        summaries = list(zip(paths, pool.map(bind(_summarize_or_error), paths)))
+        for result, (path, (document_hash, summary, error)) in zip(results, summaries):
+            result.update(document_hash=document_hash, founder_summary=summary, error=error)
+            if error:
+                logger.warning(f"[Batch] Failed to summarize {path}: {error}")
+
+        ok = [result for result in results if result["error"] is None]
+        if not ok:
+            return results
+
+        with span("stage", "embed"):
+            embedder = BatchEmbedder(get_client(), EMBED_MODEL, priority=BATCH)
+            for i, result in enumerate(ok):
+                embedder.add(i, result["founder_summary"])
+            vectors = embedder.flush()
+            founder_matrix = [vectors[i] for i in range(len(ok))]
+
+        with span("stage", "matches"):
+            all_matches = match_founders_to_vcs(founder_matrix, warm.matcher, None, top_k=top_k)
+        with span("stage", "similar_companies"):
+            all_similar = warm.portfolio_index.query_batch(founder_matrix, top_k=similar_top_k)
+        for result, matches, similar in zip(ok, all_matches, all_similar):
+            result["matches"] = matches
+            result["similar_companies"] = similar
+
+        if gap:
+            gaps = pool.map(bind(_gap_or_error), [result["founder_summary"] for result in ok], [warm.vc_summaries] * len(ok))
+            for result, gap_insights in zip(ok, gaps):
+                result["gap"] = gap_insights
+    return results
+
+def _summarize_or_error(path):
+    try:
+        return (*summarize_document(path), None)
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+def _gap_or_error(founder_summary, vc_summaries):
+    with span("stage", "gap"):
+        try:
+            return analyze_gap(founder_summary, vc_summaries)
+        except Exception as e:
+            logger.warning(f"[Batch] Gap analysis failed: {e}")
+            return None
+
+def write_jsonl(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+def write_parquet(results, path):
+    """Writes one row per document, with matches and similar companies as nested list columns."""
+    import pandas as pd
+    pd.DataFrame(results).to_parquet(path, index=False)
+
+def write_results(results, path):
+    """Writes Parquet for a .parquet path when a Parquet engine is installed, JSON Lines otherwise."""
+    if path.endswith(".parquet"):
+        try:
+            write_parquet(results, path)
+            return path
+        except ImportError as e:
+            path = path[:-len(".parquet")] + ".jsonl"
+            logger.warning(f"[Batch] Parquet unavailable ({e}), writing {path} instead")
+    write_jsonl(results, path)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match a directory of founder documents against the VC corpus.")
+    parser.add_argument("documents", help="Directory of founder documents (PDF, DOCX, TXT, MD)")
+    parser.add_argument("--out", default="matches.jsonl", help="Output file, .jsonl or .parquet")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Prebuilt VC corpus directory")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent founder summaries")
+    parser.add_argument("--top-k", type=int, default=MATCHES_TOP_K, help="VC matches kept per document")
+    parser.add_argument("--similar-top-k", type=int, default=SIMILAR_COMPANIES_TOP_K)
+    parser.add_argument("--gap", action="store_true", help="Also run the gap analysis for every document")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    warm = WarmCorpus.load(args.corpus)
+    if warm is None:
+        sys.exit(f"No VC corpus in {args.corpus}; build one with python -m agents.vc_corpus")
+    paths = find_documents(args.documents)
+    if not paths:
+        sys.exit(f"No founder documents found in {args.documents}")
+
+    run = Metrics("batch")
+    with run_scope(run):
+        results = match_documents(paths, warm, args.workers, args.top_k, args.similar_top_k, args.gap)
+    run.finish()
+    out = write_results(results, args.out)
+
+    failed = sum(1 for result in results if result["error"])
+    stages = ", ".join(f"{row['name']}={row['seconds']:.2f}s" for row in run.summary() if row["kind"] == "stage")
+    logger.info(f"[Batch] {len(paths)} documents in {run.elapsed():.2f}s ({stages})")
+    print(f"Matched {len(paths) - failed} of {len(paths)} documents against corpus {warm.version} -> {out}")
+
+if __name__ == "__main__":
+    main()
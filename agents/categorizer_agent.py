@@ -1,35 +1,160 @@
-
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 import numpy as np
-from openai import OpenAI
+from agents.openai_client import get_client
 import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from agents.embedding_store import EmbeddingMatrix
+from agents.token_budget import truncate_to_budget
+from agents.completion_cache import cached_chat_completion
+from agents.metrics import span, bind
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+N_CLUSTERS = int(os.getenv("VC_HUNTER_N_CLUSTERS", "5"))
+THEME_WORKERS = int(os.getenv("VC_HUNTER_THEME_WORKERS", "4"))
+THEME_INPUT_TOKENS = 6000
+STABILITY_TOLERANCE = 0.01
+
+_state_lock = threading.Lock()
+
+def _centroids_path(n_clusters, dim):
+    return os.path.join(CACHE_DIR, "clusters", f"centroids_{n_clusters}x{dim}.npy")
+
+def _themes_path():
+    return os.path.join(CACHE_DIR, "clusters", "themes.json")
+
+def _load_themes():
+    try:
+        with open(_themes_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_themes(themes):
+    path = _themes_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(themes, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+def membership_hash(urls, summaries):
+    digest = hashlib.sha256()
+    for url in sorted(urls):
+        digest.update(url.encode("utf-8"))
+        digest.update(hashlib.sha256(summaries.get(url, "").encode("utf-8")).digest())
+    return digest.hexdigest()
+
+def fit_clusters(vecs, n_clusters):
+    """
+    MiniBatch k-means on unit vectors, warm-started from the centroids of the previous run
+    with the same shape so labels stay stable while the corpus changes incrementally.
+    """
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    unit = vecs / norms
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    path = _centroids_path(n_clusters, unit.shape[1])
+    previous = None
+    if os.path.exists(path):
+        try:
+            previous = np.load(path)
+        except (OSError, ValueError):
+            previous = None
 
-def categorize_vcs(vc_embeddings, vc_summaries, n_clusters=5):
-    urls = list(vc_embeddings.keys())
-    vecs = np.array([vc_embeddings[url] for url in urls])
-    model = KMeans(n_clusters=n_clusters, random_state=42)
-    labels = model.fit_predict(vecs)
+    if previous is not None and previous.shape == (n_clusters, unit.shape[1]):
+        model = MiniBatchKMeans(n_clusters=n_clusters, init=previous, n_init=1, random_state=42, batch_size=1024)
+    else:
+        previous = None
+        model = MiniBatchKMeans(n_clusters=n_clusters, n_init=3, random_state=42, batch_size=1024)
+    labels = model.fit_predict(unit)
+    centroids = model.cluster_centers_
+
+    if previous is not None:
+        # Keep the previous clustering unless refitting clearly improves it, so an unchanged
+        # or slightly changed corpus keeps its clusters (and their cached themes)
+        previous_labels, previous_inertia = _assign(unit, previous)
+        _, inertia = _assign(unit, centroids)
+        if previous_inertia <= inertia * (1 + STABILITY_TOLERANCE):
+            labels, centroids = previous_labels, previous
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, np.asarray(centroids, dtype=np.float32))
+    os.replace(path + ".tmp", path)
+    return labels
+
+def _assign(unit, centroids):
+    # Squared euclidean distances without materializing an (n, k, d) array; rows are unit length
+    distances = 1.0 - 2.0 * (unit @ centroids.T) + (centroids ** 2).sum(axis=1)
+    labels = distances.argmin(axis=1)
+    return labels, float(distances[np.arange(len(unit)), labels].sum())
+
+def categorize_vcs(vc_embeddings, vc_summaries=None, n_clusters=N_CLUSTERS):
+    # vc_embeddings: EmbeddingMatrix, or dict of url -> embedding (then vc_summaries is url -> summary)
+    if isinstance(vc_embeddings, EmbeddingMatrix):
+        urls = vc_embeddings.ids
+        vecs = vc_embeddings.as_float32()
+        vc_summaries = vc_summaries or {record.url: record.summary for record in vc_embeddings}
+    else:
+        urls = list(vc_embeddings.keys())
+        vecs = np.array([vc_embeddings[url] for url in urls], dtype=np.float32)
+
+    n_clusters = min(n_clusters, len(urls))
+    if n_clusters == 0:
+        return [], {}
+
+    with _state_lock, span("stage", "fit_clusters"):
+        labels = fit_clusters(vecs, n_clusters)
 
     cluster_groups = {}
     for i, url in enumerate(urls):
         label = int(labels[i])
         cluster_groups.setdefault(label, []).append(url)
 
+    # Themes are cached by cluster membership, so only changed clusters cost an LLM call
+    with _state_lock:
+        cached_themes = _load_themes()
+    hashes = {label: membership_hash(members, vc_summaries) for label, members in cluster_groups.items()}
+    missing = [label for label in cluster_groups if hashes[label] not in cached_themes]
+
+    new_themes = {}
+    if missing:
+        def theme_for(label):
+            summaries = [vc_summaries.get(url, "") for url in cluster_groups[label]]
+            try:
+                return extract_cluster_theme("\n".join(summaries))
+            except Exception as e:
+                logger.warning(f"Failed to extract theme for cluster {label}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(THEME_WORKERS, len(missing))) as pool:
+            for label, theme in zip(missing, pool.map(bind(theme_for), missing)):
+                if theme:
+                    new_themes[hashes[label]] = theme
+        if new_themes:
+            with _state_lock:
+                themes = _load_themes()
+                themes.update(new_themes)
+                _save_themes(themes)
+    logger.info(f"[Categorizer] {len(cluster_groups)} clusters, {len(missing)} theme(s) extracted")
+
     cluster_descriptions = {}
     for label, urls_in_cluster in cluster_groups.items():
-        summaries = [vc_summaries[url] for url in urls_in_cluster]
-        combined = "\n".join(summaries)
-        theme = extract_cluster_theme(combined)
+        key = hashes[label]
         cluster_descriptions[label] = {
-            "theme": theme,
+            "theme": new_themes.get(key) or cached_themes.get(key) or f"Cluster {label}",
             "vc_urls": urls_in_cluster
         }
 
-    return labels.tolist(), cluster_descriptions
+    return [int(label) for label in labels], cluster_descriptions
 
 def extract_cluster_theme(text_block):
+    text_block, _ = truncate_to_budget(text_block, THEME_INPUT_TOKENS)
     prompt = f"""
 You are analyzing a group of VC firms based on their summaries.
 
@@ -37,8 +162,9 @@ Here is a set of firm descriptions:\n\n{text_block}
 
 Based on this, name the investment theme that most characterizes this group. Return a short label and one-sentence description.
 """
-    response = client.chat.completions.create(
+    content = cached_chat_completion(
+        get_client(),
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}]
     )
-    return response.choices[0].message.content.strip()
+    return content.strip()
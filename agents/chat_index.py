@@ -0,0 +1,164 @@
+# agents/chat_index.py
+
+import os
+import re
+import hashlib
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from agents.batch_embedder import BatchEmbedder
+from agents.embedding_store import VCRecord
+from agents.token_budget import count_tokens
+from agents.vc_matcher import normalize_rows, top_k_indices
+from agents.metrics import span, bind
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CHARS = int(os.getenv("VC_HUNTER_CHAT_CHUNK_CHARS", "1200"))   # ~300 tokens
+MAX_CHUNKS_PER_VC = int(os.getenv("VC_HUNTER_CHAT_MAX_CHUNKS_PER_VC", "24"))
+CONTEXT_TOKENS = int(os.getenv("VC_HUNTER_CHAT_CONTEXT_TOKENS", "3000"))
+TOP_K = int(os.getenv("VC_HUNTER_CHAT_TOP_K", "12"))
+INDEX_CACHE_SIZE = 8
+
+SUMMARY = "summary"
+WEBSITE = "website"
+PORTFOLIO = "portfolio"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+class Chunk:
+    __slots__ = ("vc_url", "source", "text")
+
+    def __init__(self, vc_url, source, text):
+        self.vc_url = vc_url
+        self.source = source
+        self.text = text
+
+    def render(self):
+        return f"[{self.vc_url} | {self.source}]\n{self.text}"
+
+def split_text(text, max_chars=CHUNK_CHARS):
+    """Splits text into chunks of at most max_chars, breaking at sentence ends where possible."""
+    text = " ".join(text.split())
+    chunks, current = [], ""
+    for sentence in _SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+def chunk_vc_record(record):
+    """Chunks one VC's summary, scraped website text and portfolio descriptions."""
+    if not isinstance(record, VCRecord):
+        record = VCRecord(
+            url=record["url"], summary=record.get("summary", ""), portfolio=record.get("portfolio", []),
+            raw_text=record.get("raw_text", "")
+        )
+    chunks = [Chunk(record.url, SUMMARY, text) for text in split_text(record.summary or "")]
+    portfolio_text = " ".join(
+        f"{company.get('name', '')}: {company.get('description', '')}." for company in record.portfolio
+    )
+    chunks.extend(Chunk(record.url, PORTFOLIO, text) for text in split_text(portfolio_text))
+    chunks.extend(Chunk(record.url, WEBSITE, text) for text in split_text(record.raw_text or ""))
+    return chunks[:MAX_CHUNKS_PER_VC]
+
+class ChatIndex:
+    """
+    Chunk-level embedding index over the VC corpus, used to ground chat answers.
+
+    Retrieval is one matrix-vector product and an argpartition; the selected chunks are packed
+    best-first into a token budget, so chat prompts stay the same size as the corpus grows.
+    """
+
+    def __init__(self, chunks, matrix):
+        self.chunks = chunks
+        self.matrix = normalize_rows(matrix) if len(chunks) else np.empty((0, 0), dtype=np.float32)
+
+    @classmethod
+    def build(cls, records, client, model):
+        with span("stage", "chat_index"):
+            return cls._build(records, client, model)
+
+    @classmethod
+    def _build(cls, records, client, model):
+        chunks = [chunk for record in records if record is not None for chunk in chunk_vc_record(record)]
+        embedder = BatchEmbedder(client, model)
+        for i, chunk in enumerate(chunks):
+            embedder.add(i, chunk.text)
+        vectors = embedder.flush()
+        matrix = np.array([vectors[i] for i in range(len(chunks))], dtype=np.float32)
+        logger.info(f"[Chat Index] Indexed {len(chunks)} chunks from {len(records)} VCs")
+        return cls(chunks, matrix)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def search(self, query_embedding, top_k=TOP_K):
+        """Returns [(chunk, score)] for the top_k chunks most similar to the query, best first."""
+        if not self.chunks:
+            return []
+        scores = self.matrix @ normalize_rows(np.asarray(query_embedding, dtype=np.float32))
+        return [(self.chunks[i], float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    def retrieve(self, query_embedding, max_tokens=CONTEXT_TOKENS, top_k=TOP_K):
+        """Top chunks for the query that fit in max_tokens, best first."""
+        selected, used = [], 0
+        for chunk, _ in self.search(query_embedding, top_k):
+            tokens = count_tokens(chunk.render())
+            if used + tokens > max_tokens:
+                continue
+            selected.append(chunk)
+            used += tokens
+        return selected
+
+def index_key(records):
+    digest = hashlib.sha256()
+    for record in records:
+        if record is None:
+            continue
+        if isinstance(record, VCRecord):
+            url, content, summary = record.url, record.content_hash, record.summary
+        else:
+            url, content, summary = record["url"], record.get("content_hash", ""), record.get("summary", "")
+        digest.update(f"{url}\0{content}\0{summary}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-index")
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+def prefetch_chat_index(records, client, model):
+    """Starts building the index for records in the background (shared by key) and returns its future."""
+    records = list(records)
+    key = index_key(records)
+    with _indexes_lock:
+        future = _indexes.get(key)
+        if future is None:
+            future = _indexes[key] = _builder.submit(bind(ChatIndex.build), records, client, model)
+            if len(_indexes) > INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+    return future
+
+def get_chat_index(records, client, model):
+    future = prefetch_chat_index(records, client, model)
+    try:
+        return future.result()
+    except Exception:
+        with _indexes_lock:
+            if _indexes.get(index_key(records)) is future:
+                del _indexes[index_key(records)]
+        raise
@@ -0,0 +1,208 @@
+# agents/completion_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from agents.openai_scheduler import BATCH, scheduled_chat_completion
+from agents.metrics import record
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+MAX_ENTRIES = int(os.getenv("VC_HUNTER_COMPLETION_CACHE_MAX_ENTRIES", "20000"))
+TTL_SECONDS = int(os.getenv("VC_HUNTER_COMPLETION_TTL_SECONDS", str(30 * 24 * 3600)))
+
+def completion_key(model, messages, **params):
+    """Hash of everything that determines a completion: model, messages and request params."""
+    payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CompletionCache:
+    """
+    On-disk chat completion store keyed by completion_key.
+
+    Entries expire after ttl seconds and are evicted least-recently-used beyond max_entries.
+    Concurrent requests for the same key are coalesced: one caller runs the request and the
+    others wait for its result. Safe to share across threads.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS):
+        self.path = path or os.path.join(CACHE_DIR, "completions.sqlite3")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, model TEXT, content TEXT, created_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_last_access ON completions (last_access)")
+        self._conn.commit()
+
+    def _lookup(self, key):
+        # Caller holds self._lock
+        row = self._conn.execute("SELECT content, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        content, created_at = row
+        now = time.time()
+        if self.ttl and now - created_at > self.ttl:
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return content
+
+    def get(self, key):
+        with self._lock:
+            content = self._lookup(key)
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return content
+
+    def put(self, key, model, content):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, content, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def get_or_create(self, key, model, create):
+        """
+        Returns the cached content for key, or runs create() once and caches its result.
+        Callers arriving while create() is running for the same key wait for that result.
+        """
+        with self._lock:
+            content = self._lookup(key)
+            if content is not None:
+                self.hits += 1
+            else:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    self.misses += 1
+                    future = self._inflight[key] = Future()
+                else:
+                    self.coalesced += 1
+
+        if content is not None:
+            record("cache", "completion", cache_hits=1)
+            return content
+        record("cache", "completion", cache_hits=int(not leader), cache_misses=int(leader))
+        if not leader:
+            return future.result()
+
+        try:
+            content = create()
+            self.put(key, model, content)
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _evict(self):
+        expired = self._conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (time.time() - self.ttl,)
+        ).rowcount if self.ttl else 0
+        count = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM completions WHERE key IN "
+                "(SELECT key FROM completions ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+        if expired or excess > 0:
+            logger.info(f"[Completion Cache] Evicted {expired} expired and {max(excess, 0)} least recently used entries")
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM completions"
+            ).fetchone()
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "bytes": size
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_completion_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = CompletionCache()
+        return _default_cache
+
+def cached_chat_completion(client, model, messages, priority=BATCH, **params):
+    """
+    Returns the message content of a chat completion, calling the API only on a cache miss.
+    Misses go through the rate-limit scheduler at the given priority (not part of the cache key).
+    """
+    def create():
+        response = scheduled_chat_completion(client, model, messages, priority=priority, **params)
+        return response.choices[0].message.content
+    return get_completion_cache().get_or_create(completion_key(model, messages, **params), model, create)
+
+def cached_chat_completion_stream(client, model, messages, priority=BATCH, **params):
+    """
+    Streaming variant of cached_chat_completion: yields content deltas as they arrive.
+
+    A cache hit is yielded as a single piece. Streams are not coalesced; the full text is cached
+    once the stream completes, so later identical requests are served from the cache.
+    """
+    cache = get_completion_cache()
+    key = completion_key(model, messages, **params)
+    content = cache.get(key)
+    record("cache", "completion", cache_hits=int(content is not None), cache_misses=int(content is None))
+    if content is not None:
+        yield content
+        return
+
+    stream = scheduled_chat_completion(client, model, messages, priority=priority, stream=True, **params)
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    cache.put(key, model, "".join(parts))
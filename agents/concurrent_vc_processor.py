@@ -0,0 +1,125 @@
+# agents/concurrent_vc_processor.py
+
+import os
+import json
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from agents.crawler import Crawler
+from agents.llm_embed_gap_match_chat import EMBED_MODEL, summarize_vc as summarize_vc_text
+from agents.openai_client import get_client
+from agents.batch_embedder import BatchEmbedder
+from agents.metrics import span, bind
+
+logger = logging.getLogger(__name__)
+
+# Separate limits: HTTP fetches are cheap to parallelize (further capped per host by the crawler),
+# OpenAI calls are rate limited
+HTTP_WORKERS = int(os.getenv("VC_HUNTER_HTTP_WORKERS", "8"))
+LLM_WORKERS = int(os.getenv("VC_HUNTER_LLM_WORKERS", "4"))
+
+def content_hash(raw_text, portfolio):
+    payload = json.dumps(
+        [raw_text, [[item["name"], item["description"]] for item in portfolio]],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def summarize_vc(url, raw_text, portfolio):
+    with span("stage", "summarize"):
+        summary = summarize_vc_text(url, raw_text, portfolio)
+    return {
+        "url": url,
+        "summary": summary,
+        "raw_text": raw_text,
+        "portfolio": portfolio,
+        "content_hash": content_hash(raw_text, portfolio)
+    }
+
+def embed_vc_records(records):
+    """Embeds every summary and portfolio description of the stage in batched requests, in place."""
+    with span("stage", "embed"):
+        return _embed_vc_records(records)
+
+def _embed_vc_records(records):
+    embedder = BatchEmbedder(get_client(), EMBED_MODEL)
+    for i, record in enumerate(records):
+        if record is None:
+            continue
+        if "embedding" not in record:
+            embedder.add(("summary", i), record["summary"])
+        for j, company in enumerate(record["portfolio"]):
+            if "embedding" not in company:
+                embedder.add(("portfolio", i, j), company["description"])
+
+    for owner, embedding in embedder.flush().items():
+        if owner[0] == "summary":
+            records[owner[1]]["embedding"] = embedding
+        else:
+            records[owner[1]]["portfolio"][owner[2]]["embedding"] = embedding
+    return records
+
+def iter_processed_vcs(vc_urls, http_workers=None, llm_workers=None, known_records=None):
+    """
+    Crawls, enriches and summarizes VCs concurrently, yielding results as they finish.
+    All VCs share one crawl, so portfolio companies backed by several of them are fetched once.
+    Records are not embedded yet; pass the collected records to embed_vc_records.
+
+    Args:
+        vc_urls (list of str): VC homepages to process.
+        http_workers (int): Max concurrent page fetches. Defaults to VC_HUNTER_HTTP_WORKERS.
+        llm_workers (int): Max concurrent summary calls. Defaults to VC_HUNTER_LLM_WORKERS.
+        known_records (dict): url -> previously built record. A VC whose scraped content hash
+            matches its known record reuses that record instead of being re-summarized.
+
+    Yields:
+        tuple: (index into vc_urls, record dict or None if that VC failed).
+    """
+    if not vc_urls:
+        return
+
+    http_workers = http_workers or HTTP_WORKERS
+    llm_workers = llm_workers or LLM_WORKERS
+    known_records = known_records or {}
+
+    crawler = Crawler(concurrency=http_workers)
+    with ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="vc-llm") as llm_pool:
+        fetching = {future: i for i, future in enumerate(crawler.start(vc_urls))}
+        summarizing = {}
+
+        try:
+            while fetching or summarizing:
+                done, _ = wait(list(fetching) + list(summarizing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetching:
+                        i = fetching.pop(future)
+                        try:
+                            raw_text, portfolio = future.result()
+                        except Exception as e:
+                            logger.warning(f"Failed to fetch VC {vc_urls[i]}: {e}")
+                            yield i, None
+                            continue
+                        known = known_records.get(vc_urls[i])
+                        if known and known.get("content_hash") == content_hash(raw_text, portfolio):
+                            yield i, known
+                            continue
+                        summarizing[llm_pool.submit(bind(summarize_vc), vc_urls[i], raw_text, portfolio)] = i
+                    else:
+                        i = summarizing.pop(future)
+                        try:
+                            yield i, future.result()
+                        except Exception as e:
+                            logger.warning(f"Failed to summarize VC {vc_urls[i]}: {e}")
+                            yield i, None
+        finally:
+            # Closed early (e.g. the pipeline failed): drop summaries that have not started yet
+            for future in summarizing:
+                future.cancel()
+            crawler.close()
+
+def process_vcs(vc_urls, http_workers=None, llm_workers=None, known_records=None):
+    """Runs iter_processed_vcs to completion and returns embedded records in input order (None for failures)."""
+    records = [None] * len(vc_urls)
+    for i, record in iter_processed_vcs(vc_urls, http_workers, llm_workers, known_records):
+        records[i] = record
+    return embed_vc_records(records)
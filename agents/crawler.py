@@ -0,0 +1,290 @@
+# agents/crawler.py
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from agents.http_client import fetch, is_fresh, canonicalize_url, USER_AGENT
+from agents.html_extract import extract
+from agents.website_scraper_agent import MAX_PORTFOLIO_LINKS, is_portfolio_link
+from agents.portfolio_enricher_agent import company_entry
+from agents.metrics import span, bind
+
+logger = logging.getLogger(__name__)
+
+CRAWL_CONCURRENCY = int(os.getenv("VC_HUNTER_HTTP_WORKERS", "8"))
+PER_DOMAIN_CONCURRENCY = int(os.getenv("VC_HUNTER_CRAWL_PER_DOMAIN", "2"))
+DOMAIN_DELAY = float(os.getenv("VC_HUNTER_CRAWL_DOMAIN_DELAY", "0.5"))  # Seconds between requests to one host
+MAX_DEPTH = int(os.getenv("VC_HUNTER_CRAWL_MAX_DEPTH", "2"))
+RESPECT_ROBOTS = os.getenv("VC_HUNTER_CRAWL_RESPECT_ROBOTS", "1") == "1"
+FETCH_TIMEOUT = 10
+LISTING_MIN_LINKS = 3  # A portfolio page linking to at least this many companies is a listing, not a company
+
+# What a page is loaded as: a VC homepage (text and links), a portfolio page that may be a listing
+# (links and company entry), or a page known to be a company (company entry only, parsing stops early)
+HOME = "home"
+PORTFOLIO = "portfolio"
+COMPANY = "company"
+
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".mp4", ".doc", ".docx")
+SOCIAL_SITES = (
+    "twitter.com", "x.com", "linkedin.com", "facebook.com", "instagram.com", "youtube.com",
+    "medium.com", "github.com", "crunchbase.com", "google.com", "apple.com"
+)
+
+def _site(url):
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def _is_social(site):
+    return any(site == social or site.endswith("." + social) for social in SOCIAL_SITES)
+
+def _parse(url, response, kind):
+    return extract(response.content, url, response.encoding, text=kind == HOME, links=kind != COMPANY, company=kind != HOME)
+
+def company_links(page, vc_site):
+    """
+    Links on a portfolio listing page that look like companies: pages below the listing's own path
+    on the VC's site (/portfolio/acme under /portfolio), or other sites that are not social networks.
+    """
+    base = urlsplit(page.url).path.rstrip("/")
+    links = {}
+    for href, _ in page.links:
+        site = _site(href)
+        if site == vc_site:
+            if base and urlsplit(href).path.startswith(base + "/"):
+                links.setdefault(canonicalize_url(href), href)
+        elif not _is_social(site):
+            links.setdefault(canonicalize_url(href), href)
+    return list(links)
+
+class _Domain:
+    __slots__ = ("slots", "lock", "next_request")
+
+    def __init__(self, per_domain):
+        self.slots = asyncio.Semaphore(per_domain)
+        self.lock = asyncio.Lock()
+        self.next_request = 0.0
+
+class Crawler:
+    """
+    Asyncio crawler for VC homepages and their portfolio pages.
+
+    Every page goes through one frontier keyed by canonical URL, so a company backed by several
+    VCs is fetched and parsed once per crawl and shared. Requests are capped globally and per host,
+    spaced by a politeness delay per host (pages fresh in the page cache skip it), and checked
+    against robots.txt. From each homepage, portfolio links are followed up to max_depth: a page
+    that links to several companies is treated as a listing and expanded, any other is a company.
+
+    Fetching and parsing run in worker threads through http_client.fetch, so the page cache,
+    conditional GETs and metrics behave exactly as for the synchronous scrapers.
+    """
+
+    def __init__(self, concurrency=None, per_domain=PER_DOMAIN_CONCURRENCY, domain_delay=DOMAIN_DELAY,
+                 max_depth=MAX_DEPTH, max_portfolio_pages=MAX_PORTFOLIO_LINKS, respect_robots=RESPECT_ROBOTS):
+        self.concurrency = concurrency or CRAWL_CONCURRENCY
+        self.per_domain = per_domain
+        self.domain_delay = domain_delay
+        self.max_depth = max_depth
+        self.max_portfolio_pages = max_portfolio_pages
+        self.respect_robots = respect_robots
+        self.requests = 0
+        self.shared = 0
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._domains = {}
+        self._pages = {}    # (canonical url, kind) -> Task[PageContent or None]; the frontier
+        self._robots = {}   # scheme://host -> Task[RobotFileParser or None]
+        self._loop = None
+        self._main = None
+        self._thread = None
+        self._futures = []
+        self._closed = False
+
+    # Fetching
+
+    async def _get(self, url):
+        """GETs url in a worker thread under the per-host and global caps and the politeness delay."""
+        domain = self._domains.get(urlsplit(url).netloc)
+        if domain is None:
+            domain = self._domains[urlsplit(url).netloc] = _Domain(self.per_domain)
+        fresh = self.domain_delay <= 0 or await asyncio.to_thread(is_fresh, url)
+        async with domain.slots:
+            if not fresh and self.domain_delay > 0:
+                async with domain.lock:
+                    loop = asyncio.get_running_loop()
+                    wait = domain.next_request - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    domain.next_request = loop.time() + self.domain_delay
+            async with self._slots:
+                response = await asyncio.to_thread(fetch, url, FETCH_TIMEOUT)
+                self.requests += not response.from_cache
+                return response
+
+    async def _allowed(self, url):
+        if not self.respect_robots:
+            return True
+        parts = urlsplit(url)
+        root = f"{parts.scheme}://{parts.netloc}"
+        task = self._robots.get(root)
+        if task is None:
+            task = self._robots[root] = asyncio.ensure_future(self._load_robots(root))
+        parser = await asyncio.shield(task)
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    async def _load_robots(self, root):
+        try:
+            response = await self._get(f"{root}/robots.txt")
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        return parser
+
+    def page(self, url, kind=PORTFOLIO):
+        """Single-flight: returns the shared task loading url's canonical form as kind."""
+        canonical = canonicalize_url(url)
+        task = self._pages.get((canonical, kind))
+        if task is None and kind == COMPANY:
+            # A portfolio load has everything a company load needs
+            task = self._pages.get((canonical, PORTFOLIO))
+        if task is None:
+            task = self._pages[(canonical, kind)] = asyncio.ensure_future(self._load(canonical, kind))
+        else:
+            self.shared += 1
+        # Shielded, so a cancelled VC doesn't cancel a page other VCs are waiting on
+        return asyncio.shield(task)
+
+    async def _load(self, url, kind):
+        if urlsplit(url).path.lower().endswith(SKIP_EXTENSIONS):
+            return None
+        try:
+            if not await self._allowed(url):
+                logger.info(f"[Crawler] Skipping {url}, disallowed by robots.txt")
+                return None
+            response = await self._get(url)
+            if response.status_code != 200:
+                return None
+            return await asyncio.to_thread(_parse, url, response, kind)
+        except Exception as e:
+            logger.warning(f"[Crawler] Failed to fetch {url}: {e}")
+            return None
+
+    # Traversal
+
+    async def crawl_vc(self, url):
+        """Returns (homepage text, portfolio company dicts) for one VC."""
+        with span("stage", "scrape"):
+            home = await self.page(url, HOME)
+        if home is None:
+            return "", []
+        with span("stage", "enrich"):
+            portfolio = await self._portfolio(home)
+        return home.text, portfolio
+
+    async def _portfolio(self, home):
+        vc_site = _site(home.url)
+        companies = {}
+        seen = {home.url}
+        frontier = [href for href, anchor_text in home.links if is_portfolio_link(href, anchor_text)]
+        depth = 1
+        while frontier and depth <= self.max_depth and len(companies) < self.max_portfolio_pages:
+            urls = []
+            for href in frontier:
+                key = canonicalize_url(href)
+                if key not in seen:
+                    seen.add(key)
+                    urls.append(key)
+            urls = urls[:self.max_portfolio_pages - len(companies)]
+            # At the last level nothing gets expanded, so only company entries are needed
+            kind = PORTFOLIO if depth < self.max_depth else COMPANY
+            pages = await asyncio.gather(*(self.page(url, kind) for url in urls))
+
+            frontier = []
+            for page in pages:
+                if page is None:
+                    continue
+                links = company_links(page, vc_site) if kind == PORTFOLIO else []
+                if len(links) >= LISTING_MIN_LINKS:
+                    frontier.extend(links)
+                elif len(companies) < self.max_portfolio_pages:
+                    # A fresh dict per VC, so per-VC changes (embeddings) don't leak into other records
+                    companies[page.url] = company_entry(page)
+            depth += 1
+        return list(companies.values())
+
+    # Running
+
+    def start(self, vc_urls):
+        """
+        Crawls vc_urls on a background event loop.
+
+        Returns:
+            list of concurrent.futures.Future: One per VC, resolving to (raw_text, portfolio)
+            as soon as that VC's crawl finishes.
+        """
+        futures = self._futures = [Future() for _ in vc_urls]
+        self._thread = threading.Thread(
+            target=bind(asyncio.run), args=(self._crawl_all(list(vc_urls), futures),), name="vc-crawler", daemon=True
+        )
+        self._thread.start()
+        return futures
+
+    async def _crawl_all(self, vc_urls, futures):
+        self._loop = asyncio.get_running_loop()
+        self._main = asyncio.current_task()
+        # to_thread runs on the default executor; size it to the crawl's own concurrency
+        executor = ThreadPoolExecutor(max_workers=self.concurrency + 2, thread_name_prefix="vc-crawl")
+        self._loop.set_default_executor(executor)
+
+        async def crawl_one(i, url):
+            try:
+                futures[i].set_result(await self.crawl_vc(url))
+            except asyncio.CancelledError:
+                futures[i].cancel()
+                raise
+            except Exception as e:
+                futures[i].set_exception(e)
+
+        try:
+            if self._closed:
+                raise asyncio.CancelledError
+            await asyncio.gather(*(crawl_one(i, url) for i, url in enumerate(vc_urls)))
+            logger.info(
+                f"[Crawler] {len(vc_urls)} VCs: {len(self._pages)} unique pages, {self.requests} requests, "
+                f"{self.shared} page loads shared across VCs"
+            )
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """Cancels an unfinished crawl and waits for its thread."""
+        self._closed = True
+        loop, main = self._loop, self._main
+        unfinished = not all(future.done() for future in self._futures)
+        if unfinished and loop is not None and main is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(main.cancel)
+            except RuntimeError:
+                pass  # Loop finished in the meantime
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+def crawl_vcs(vc_urls, concurrency=None, **kwargs):
+    """Crawls vc_urls and returns [(raw_text, portfolio)] in input order; failed VCs get ("", [])."""
+    crawler = Crawler(concurrency=concurrency, **kwargs)
+    results = []
+    for url, future in zip(vc_urls, crawler.start(vc_urls)):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logger.warning(f"[Crawler] Failed to crawl {url}: {e}")
+            results.append(("", []))
+    crawler.close()
+    return results
@@ -0,0 +1,121 @@
+# agents/document_ingest.py
+
+import io
+import os
+import hashlib
+import logging
+import zipfile
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import docx2txt
+from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+MAX_EXTRACTED_CHARS = int(os.getenv("VC_HUNTER_MAX_DOC_CHARS", "400000"))
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("VC_HUNTER_PDF_PARALLEL_PAGES", "24"))
+PDF_WORKERS = int(os.getenv("VC_HUNTER_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+CACHE_SIZE = 32
+
+PDF = "pdf"
+DOCX = "docx"
+TEXT = "text"
+
+def detect_format(data):
+    """Detects the document format from magic bytes rather than the (user supplied) file name."""
+    if b"%PDF-" in data[:1024]:
+        return PDF
+    if data[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            pass
+    return TEXT
+
+def _extract_pdf_pages(data, start, stop):
+    # Runs in worker processes, so it re-opens the PDF from bytes instead of sharing a reader
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs Streamlit and worker threads is unsafe
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def extract_pdf_text(data, max_chars=MAX_EXTRACTED_CHARS):
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+
+    if page_count >= PARALLEL_PAGE_THRESHOLD and PDF_WORKERS > 1:
+        chunk = -(-page_count // PDF_WORKERS)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        try:
+            futures = [_get_pool().submit(_extract_pdf_pages, data, start, stop) for start, stop in ranges]
+            pages = [text for future in futures for text in future.result()]
+            return "\n".join(text for text in pages if text)[:max_chars]
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed, falling back to serial: {e}")
+
+    parts = []
+    size = 0
+    for page in reader.pages:
+        text = page.extract_text()
+        if not text:
+            continue
+        parts.append(text)
+        size += len(text) + 1
+        if size >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+def extract_docx_text(data, max_chars=MAX_EXTRACTED_CHARS):
+    return (docx2txt.process(io.BytesIO(data)) or "")[:max_chars]
+
+def extract_plain_text(data, max_chars=MAX_EXTRACTED_CHARS):
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin1")
+    return text[:max_chars]
+
+_EXTRACTORS = {
+    PDF: extract_pdf_text,
+    DOCX: extract_docx_text,
+    TEXT: extract_plain_text
+}
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def extract_document_text(data, max_chars=MAX_EXTRACTED_CHARS):
+    """
+    Extracts text from an in-memory PDF, DOCX or plain-text document.
+
+    Large PDFs are split across a process pool by page range. Output is capped at max_chars and
+    cached by document hash, so re-submitting the same upload is free.
+    """
+    key = (hashlib.sha256(data).hexdigest(), max_chars)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    doc_format = detect_format(data)
+    text = _EXTRACTORS[doc_format](data, max_chars)
+    logger.info(f"[Document Ingest] Extracted {len(text)} characters from {doc_format} document")
+
+    with _cache_lock:
+        _cache[key] = text
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
@@ -0,0 +1,149 @@
+# agents/embedding_cache.py
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+MAX_ENTRIES = int(os.getenv("VC_HUNTER_EMBED_CACHE_MAX_ENTRIES", "100000"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text):
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+def embedding_key(text, model):
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+class EmbeddingCache:
+    """
+    On-disk embedding store keyed by (model, normalized-text hash).
+
+    Vectors are stored as float32 blobs in SQLite and evicted least-recently-used
+    once the store holds more than max_entries rows. Safe to share across threads.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.path = path or os.path.join(CACHE_DIR, "embeddings.sqlite3")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT, dim INTEGER, vector BLOB, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings (last_access)")
+        self._conn.commit()
+
+    def get(self, text, model):
+        return self.get_many([text], model)[0]
+
+    def get_many(self, texts, model):
+        """Returns a list aligned with texts holding float32 vectors, or None for misses."""
+        keys = [embedding_key(text, model) for text in texts]
+        found = {}
+        now = time.time()
+        with self._lock:
+            unique_keys = list(set(keys))
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+            results = [found.get(key) for key in keys]
+            hit_count = sum(1 for vec in results if vec is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put(self, text, model, vector):
+        self.put_many([text], model, [vector])
+
+    def put_many(self, texts, model, vectors):
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            vec = np.asarray(vector, dtype=np.float32)
+            rows.append((embedding_key(text, model), model, vec.shape[0], vec.tobytes(), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+            logger.info(f"[Embedding Cache] Evicted {excess} least recently used entries")
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "bytes": size
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
+
+def cached_embedding(text, model, embed_func):
+    """Returns the cached float32 embedding for text, calling embed_func(text) only on a miss."""
+    cache = get_embedding_cache()
+    vector = cache.get(text, model)
+    if vector is None:
+        vector = embed_func(text)
+        cache.put(text, model, vector)
+    return np.asarray(vector, dtype=np.float32)
@@ -0,0 +1,102 @@
+# agents/embedding_store.py
+
+import os
+import numpy as np
+
+EMBED_DTYPE = os.getenv("VC_HUNTER_EMBED_DTYPE", "float32")  # float16 halves memory again
+
+class VCRecord:
+    __slots__ = ("url", "summary", "portfolio", "raw_text", "content_hash", "cluster", "theme")
+
+    def __init__(self, url, summary="", portfolio=None, raw_text="", content_hash="", cluster=0, theme="N/A"):
+        self.url = url
+        self.summary = summary
+        self.portfolio = portfolio or []
+        self.raw_text = raw_text
+        self.content_hash = content_hash
+        self.cluster = cluster
+        self.theme = theme
+
+class EmbeddingMatrix:
+    """
+    Contiguous (n, d) embedding matrix with an id -> row map and one VCRecord per row.
+
+    Agents read rows straight out of the matrix instead of converting per-entity lists, and
+    the unit-normalized float32 copy needed for cosine scoring is computed once and shared.
+    """
+    __slots__ = ("ids", "matrix", "records", "_rows", "_normalized")
+
+    def __init__(self, ids, matrix, records=None, dtype=None):
+        dtype = np.dtype(dtype or EMBED_DTYPE)
+        self.ids = list(ids)
+        matrix = np.ascontiguousarray(matrix, dtype=dtype)
+        if self.ids:
+            self.matrix = matrix.reshape(len(self.ids), -1)
+        else:
+            # Every VC failed: reshape(0, -1) is ambiguous, so keep the width when there is one
+            self.matrix = matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+        self.records = records if records is not None else [VCRecord(id_) for id_ in self.ids]
+        self._rows = {id_: row for row, id_ in enumerate(self.ids)}
+        self._normalized = None
+
+    @classmethod
+    def from_vc_records(cls, records, dtype=None):
+        """Builds the matrix from process_vcs / corpus style dicts, skipping None and unembedded entries."""
+        records = [r for r in records if r is not None and r.get("embedding") is not None]
+        ids = [r["url"] for r in records]
+        dim = len(records[0]["embedding"]) if records else 0
+        matrix = np.empty((len(records), dim), dtype=np.dtype(dtype or EMBED_DTYPE))
+        for row, record in enumerate(records):
+            matrix[row] = record["embedding"]
+        vc_records = [
+            VCRecord(
+                url=r["url"],
+                summary=r.get("summary", ""),
+                portfolio=r.get("portfolio", []),
+                raw_text=r.get("raw_text", ""),
+                content_hash=r.get("content_hash", ""),
+                cluster=r.get("cluster", 0),
+                theme=r.get("theme", "N/A")
+            )
+            for r in records
+        ]
+        return cls(ids, matrix, vc_records, dtype)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_):
+        return id_ in self._rows
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @property
+    def dim(self):
+        return self.matrix.shape[1]
+
+    def row(self, id_):
+        return self._rows[id_]
+
+    def vector(self, id_):
+        return self.matrix[self._rows[id_]]
+
+    def record(self, id_):
+        return self.records[self._rows[id_]]
+
+    def as_float32(self):
+        """The matrix as float32; a view when already stored as float32."""
+        return self.matrix if self.matrix.dtype == np.float32 else self.matrix.astype(np.float32)
+
+    def normalized(self):
+        """Unit-normalized float32 rows, computed on first use and cached."""
+        if self._normalized is None:
+            matrix = self.as_float32()
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._normalized = matrix / norms
+        return self._normalized
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes
@@ -1,66 +1,248 @@
 # agents/founder_doc_reader_and_orchestrator.py
 
+import queue
 import logging
-from agents.website_scraper_agent import scrape_vc_website
-from agents.portfolio_enricher_agent import enrich_portfolio_data
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from agents.concurrent_vc_processor import iter_processed_vcs, embed_vc_records
+from agents.vc_corpus import load_corpus
+from agents.embedding_store import EmbeddingMatrix
 from agents.llm_embed_gap_match_chat import (
     generate_founder_summary,
-    generate_vc_summary,
     match_founder_to_vcs,
-    analyze_gap
+    analyze_gap,
+    prefetch_chat_index
 )
-from agents.utils import safe_truncate_text
-from agents.relationship_agent import build_relationship_graph
+from agents.document_ingest import extract_document_text
+from agents.relationship_agent import build_relationship_graph, plot_relationship_graph
 from agents.visualization_agent import generate_cluster_plot
+from agents.categorizer_agent import categorize_vcs
+from agents.projection import corpus_fingerprint
+from agents.lazy_figures import LazyFigure, figure_key
+from agents.metrics import Metrics, run_scope, span, traced, bind
 from agents.similar_company_agent import find_similar_companies
 
 logger = logging.getLogger(__name__)
 
-def run_full_pipeline(founder_doc_bytes, vc_urls):
+SIMILAR_COMPANIES_TOP_K = 20
+
+# Stages emitted by iter_full_pipeline, in the order they normally arrive
+FOUNDER_SUMMARY = "founder_summary"
+VC_SUMMARIZED = "vc_summarized"
+MATCHES = "matches"
+SIMILAR_COMPANIES = "similar_companies"
+GAP = "gap"
+VISUALS = "visuals"
+COMPLETE = "complete"
+
+class PipelineEvent:
+    """
+    One step of iter_full_pipeline. completed/total track VC progress for VC_SUMMARIZED events.
+    """
+    __slots__ = ("stage", "data", "completed", "total")
+
+    def __init__(self, stage, data, completed=None, total=None):
+        self.stage = stage
+        self.data = data
+        self.completed = completed
+        self.total = total
+
+    def __repr__(self):
+        return f"PipelineEvent(stage={self.stage!r}, completed={self.completed}, total={self.total})"
+
+def iter_vc_records(vc_urls, corpus=None, http_workers=None, llm_workers=None):
+    """
+    Yields (index, record) for vc_urls as records become available (record is None on failure).
+    VCs in the prebuilt corpus come first; the rest are processed live and are not embedded
+    yet, so pass the collected records to embed_vc_records.
+    """
+    prebuilt = {record["url"]: record for record in corpus["records"]} if corpus else {}
+    missing = []
+    for i, url in enumerate(vc_urls):
+        if url in prebuilt:
+            yield i, prebuilt[url]
+        else:
+            missing.append(i)
+
+    if missing:
+        logger.info(f"{len(missing)} of {len(vc_urls)} VCs not in the prebuilt corpus, processing live")
+        live_urls = [vc_urls[i] for i in missing]
+        for j, record in iter_processed_vcs(live_urls, http_workers=http_workers, llm_workers=llm_workers):
+            yield missing[j], record
+
+def load_vc_records(vc_urls, corpus=None, http_workers=None, llm_workers=None):
+    """
+    Returns embedded VC records for vc_urls in input order (None for failures), taken from the
+    prebuilt corpus where available. VCs missing from the corpus are processed live.
+    """
+    records = [None] * len(vc_urls)
+    for i, record in iter_vc_records(vc_urls, corpus, http_workers, llm_workers):
+        records[i] = record
+    return embed_vc_records(records)
+
+def build_visuals(vc_embeddings, founder_embedding=None):
+    """
+    Returns the pipeline's figures as LazyFigures, built on first view off the request path.
+
+    Keys combine the embedding version with what each figure draws (cluster labels and themes,
+    portfolios), so repeat runs over the same corpus reuse both the figures and their layouts.
+    """
+    version = corpus_fingerprint(vc_embeddings.ids, vc_embeddings.as_float32())
+    records = list(vc_embeddings)
+    founder_version = "" if founder_embedding is None else corpus_fingerprint(["founder"], [founder_embedding])
+    return {
+        "clusters": LazyFigure(
+            figure_key("clusters", version, founder_version, *((vc.cluster, vc.theme) for vc in records)),
+            lambda: generate_cluster_plot(vc_embeddings, founder_embedding=founder_embedding, corpus_version=version)
+        ),
+        "relationships": LazyFigure(
+            figure_key("relationships", version, *(vc.content_hash for vc in records)),
+            lambda: plot_relationship_graph(build_relationship_graph(vc_embeddings))
+        )
+    }
+
+def iter_full_pipeline(founder_doc_bytes, vc_urls, corpus=None, http_workers=None, llm_workers=None, run=None):
+    """
+    Runs the founder-to-VC analysis, yielding a PipelineEvent as each stage finishes.
+
+    The founder summary is yielded as soon as it is ready, each VC as it is summarized, then
+    matches, similar companies, gap analysis and visuals (as LazyFigures). The final COMPLETE event carries the
+    same dict run_full_pipeline returns, including the run's Metrics (stage and external call spans).
+    """
+    run = run or Metrics("pipeline")
+    with run_scope(run):
+        yield from _iter_full_pipeline(founder_doc_bytes, vc_urls, corpus, http_workers, llm_workers, run)
+
+def _iter_full_pipeline(founder_doc_bytes, vc_urls, corpus, http_workers, llm_workers, run):
+    with span("stage", "extract_document", bytes=len(founder_doc_bytes)):
+        text = extract_document_text(founder_doc_bytes)
+    with span("stage", "load_corpus"):
+        corpus = corpus or load_corpus()
+    total = len(vc_urls)
+
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline")
+    stop = threading.Event()
+    try:
+        # Founder summary and VC records are produced in the background and reported in
+        # whichever order they finish; bind() carries the run into the worker threads
+        events = queue.Queue()
+        founder_future = pool.submit(bind(traced("stage", "founder_summary", generate_founder_summary)), text)
+        founder_future.add_done_callback(lambda _: events.put((FOUNDER_SUMMARY, None)))
+
+        def produce_vc_records():
+            try:
+                with span("stage", "vc_records"):
+                    vc_records = iter_vc_records(vc_urls, corpus, http_workers, llm_workers)
+                    try:
+                        for i, record in vc_records:
+                            if stop.is_set():
+                                break
+                            events.put((VC_SUMMARIZED, (i, record)))
+                    finally:
+                        # Stops the crawl and any queued summaries when the run is abandoned
+                        vc_records.close()
+                events.put((COMPLETE, None))
+            except Exception as e:
+                events.put((COMPLETE, e))
+
+        pool.submit(bind(produce_vc_records))
+
+        founder_summary = founder_embedding = None
+        records = [None] * total
+        completed = 0
+        vcs_done = False
+        while founder_summary is None or not vcs_done:
+            kind, payload = events.get()
+            if kind == FOUNDER_SUMMARY:
+                founder_summary, founder_embedding = founder_future.result()
+                yield PipelineEvent(FOUNDER_SUMMARY, founder_summary)
+            elif kind == VC_SUMMARIZED:
+                i, record = payload
+                records[i] = record
+                completed += 1
+                yield PipelineEvent(VC_SUMMARIZED, {"url": vc_urls[i], "record": record}, completed, total)
+            else:
+                if payload is not None:
+                    raise payload
+                vcs_done = True
+
+        embed_vc_records(records)
+
+        for url, record in zip(vc_urls, records):
+            if record is None:
+                logger.warning(f"Skipping VC that failed processing: {url}")
+
+        # One contiguous matrix shared by matching, similar companies and the plots
+        vc_embeddings = EmbeddingMatrix.from_vc_records(records)
+        vc_summaries = [{"url": vc.url, "summary": vc.summary} for vc in vc_embeddings]
+
+        # Chat retrieval index builds in the background while the remaining stages run
+        prefetch_chat_index(vc_embeddings.records)
+
+        # Gap analysis is a slow chat call, so start it before the local stages
+        gap_future = pool.submit(bind(traced("stage", "gap", analyze_gap)), founder_summary, [vc['summary'] for vc in vc_summaries])
+
+        with span("stage", "matches"):
+            matches = match_founder_to_vcs(founder_embedding, vc_embeddings, vc_summaries)
+        yield PipelineEvent(MATCHES, matches)
+
+        # The corpus index is only valid when every requested VC came from the corpus
+        portfolio_index = corpus.get("portfolio_index") if corpus else None
+        corpus_urls = {record["url"] for record in corpus["records"]} if corpus else set()
+        with span("stage", "similar_companies"):
+            if portfolio_index is not None and all(url in corpus_urls for url in vc_urls):
+                similar_companies = find_similar_companies(
+                    founder_embedding, portfolio_index, top_k=SIMILAR_COMPANIES_TOP_K, vc_filter=vc_urls
+                )
+            else:
+                similar_companies = find_similar_companies(founder_embedding, vc_embeddings, top_k=SIMILAR_COMPANIES_TOP_K)
+        yield PipelineEvent(SIMILAR_COMPANIES, similar_companies)
+
+        with span("stage", "cluster"):
+            labels, clusters = categorize_vcs(vc_embeddings)
+        for vc, label in zip(vc_embeddings, labels):
+            vc.cluster = label
+            vc.theme = clusters[label]["theme"]
+
+        visuals = build_visuals(vc_embeddings, founder_embedding)
+
+        if gap_future.done():
+            gap_insights = gap_future.result()
+            yield PipelineEvent(GAP, gap_insights)
+            yield PipelineEvent(VISUALS, visuals)
+        else:
+            yield PipelineEvent(VISUALS, visuals)
+            gap_insights = gap_future.result()
+            yield PipelineEvent(GAP, gap_insights)
+    except BaseException:
+        # A failed founder summary (or a consumer closing the generator) ends the run now instead
+        # of after every VC has been scraped and summarized; the VC producer stops in the background
+        stop.set()
+        raise
+    finally:
+        pool.shutdown(wait=not stop.is_set(), cancel_futures=stop.is_set())
+
+    run.finish()
+    stages = ", ".join(f"{row['name']}={row['seconds']:.2f}s" for row in run.summary() if row["kind"] == "stage")
+    logger.info(f"[Pipeline] Finished {total} VCs in {run.elapsed():.2f}s ({stages})")
+
+    yield PipelineEvent(COMPLETE, {
+        "founder_summary": founder_summary,
+        "vc_summaries": vc_summaries,
+        "vc_records": vc_embeddings.records,
+        "matches": matches,
+        "gap": gap_insights,
+        "similar_companies": similar_companies,
+        "clusters": clusters,
+        "visuals": visuals,
+        "metrics": run
+    })
+
+def run_full_pipeline(founder_doc_bytes, vc_urls, corpus=None, http_workers=None, llm_workers=None):
     try:
-        # Decode bytes assuming UTF-8 plain text or fallback
-        try:
-            text = founder_doc_bytes.decode("utf-8")
-        except UnicodeDecodeError:
-            text = founder_doc_bytes.decode("latin1")
-
-        founder_summary, founder_embedding = generate_founder_summary(text)
-
-        vc_summaries = []
-        vc_embeddings = []
-
-        for i, url in enumerate(vc_urls):
-            raw_text, portfolio_links = scrape_vc_website(url)
-            enriched = enrich_portfolio_data(portfolio_links)
-            summary, embedding = generate_vc_summary(url, raw_text, enriched)
-            vc_summaries.append({"url": url, "summary": summary})
-            vc_embeddings.append({
-                "url": url,
-                "embedding": embedding,
-                "portfolio": enriched,
-                "summary": summary,               # Ensure summary is present
-                "cluster": i,                      # Dummy cluster ID
-                "theme": f"Cluster {i}"            # Dummy theme name
-            })
-
-        matches = match_founder_to_vcs(founder_embedding, vc_embeddings, vc_summaries)
-        gap_insights = analyze_gap(founder_summary, [vc['summary'] for vc in vc_summaries])
-        similar_companies = find_similar_companies(founder_embedding, vc_embeddings)
-
-        cluster_plot = generate_cluster_plot(vc_embeddings)
-        relationship_plot = build_relationship_graph(vc_embeddings, similar_companies)
-
-        return {
-            "founder_summary": founder_summary,
-            "vc_summaries": vc_summaries,
-            "matches": matches,
-            "gap": gap_insights,
-            "similar_companies": similar_companies,
-            "visuals": {
-                "clusters": cluster_plot,
-                "relationships": relationship_plot
-            }
-        }
+        for event in iter_full_pipeline(founder_doc_bytes, vc_urls, corpus, http_workers, llm_workers):
+            if event.stage == COMPLETE:
+                return event.data
 
     except Exception as e:
         logger.error("Error in full pipeline execution", exc_info=True)
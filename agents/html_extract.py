@@ -0,0 +1,262 @@
+# agents/html_extract.py
+
+import os
+import codecs
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+logger = logging.getLogger(__name__)
+
+# "auto" uses lxml when it is installed, "html.parser" forces the standard library parser
+BACKEND = os.getenv("VC_HUNTER_HTML_BACKEND", "auto")
+FEED_CHARS = 64 * 1024
+MAX_TEXT_CHARS = 3000
+MIN_BLOCK_CHARS = 40
+COMPANY_PARAGRAPHS = 3
+MAX_DESCRIPTION_CHARS = 1000
+
+TEXT_TAGS = {"p", "h1", "h2", "h3", "li"}
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"
+}
+# Block-level tags that implicitly close an open <p>, as browsers do
+CLOSES_PARAGRAPH = {
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre", "section",
+    "table", "ul"
+}
+
+class PageContent:
+    """What the scrapers keep from a page: title, text blocks, company paragraphs and links."""
+    __slots__ = ("url", "title", "blocks", "paragraphs", "links")
+
+    def __init__(self, url, title, blocks, paragraphs, links):
+        self.url = url
+        self.title = title
+        self.blocks = blocks
+        self.paragraphs = paragraphs
+        self.links = links
+
+    @property
+    def text(self):
+        """Text blocks longer than MIN_BLOCK_CHARS, newline separated, capped at MAX_TEXT_CHARS."""
+        return "\n".join(self.blocks)[:MAX_TEXT_CHARS]
+
+    @property
+    def description(self):
+        """The first COMPANY_PARAGRAPHS paragraphs, as a single line."""
+        return " ".join(self.paragraphs).strip()[:MAX_DESCRIPTION_CHARS]
+
+class _Done(Exception):
+    """Raised from inside the parser once everything asked for has been collected."""
+
+class _Collector:
+    """
+    Parser-independent extraction state, fed start/end/data events (lxml's target interface).
+
+    Collects in one pass: the title, leaf text blocks of TEXT_TAGS, the first paragraphs and
+    links with their anchor text. Content of SKIP_TAGS is ignored. Raises _Done as soon as every
+    requested part is complete, so the rest of the page is never parsed.
+    """
+
+    def __init__(self, url, text, links, company):
+        self.url = url
+        self.want_text = text
+        self.want_links = links
+        self.want_company = company
+        self.title = None
+        self.blocks = []
+        self.paragraphs = []
+        self.links = []
+        self._stack = []
+        self._skip = 0
+        self._in_title = False
+        self._title_parts = []
+        self._text_depth = 0
+        self._block = []
+        self._text_chars = 0
+        self._paragraph = None
+        self._paragraph_depth = 0
+        self._anchor = None
+
+    # lxml target interface
+
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        if tag in CLOSES_PARAGRAPH and "p" in self._stack:
+            self.end("p")
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.data(" ")
+            return
+        if tag == "li" and self._stack and self._stack[-1] == "li":
+            self.end("li")
+        self._stack.append(tag)
+
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "a" and self.want_links and attrs.get("href"):
+            self._anchor = (attrs["href"].strip(), [])
+
+        if tag in TEXT_TAGS:
+            self._flush_block()
+            self._text_depth += 1
+            if self._paragraph is not None:
+                self._paragraph.append(" ")
+        if tag == "p" and self.want_company and len(self.paragraphs) < COMPANY_PARAGRAPHS:
+            if self._paragraph is None:
+                self._paragraph = []
+            self._paragraph_depth += 1
+
+    def end(self, tag):
+        tag = tag.lower()
+        if tag not in self._stack:
+            return
+        # Closing a tag closes everything opened inside it
+        while self._stack:
+            open_tag = self._stack.pop()
+            self._close(open_tag)
+            if open_tag == tag:
+                break
+        if self._is_done():
+            raise _Done
+
+    def data(self, data):
+        if self._skip:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._text_depth and self.want_text:
+            self._block.append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        if self._anchor is not None:
+            self._anchor[1].append(data)
+
+    def close(self):
+        while self._stack:
+            self._close(self._stack.pop())
+        return self
+
+    # State
+
+    def _close(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip -= 1
+        elif tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = " ".join("".join(self._title_parts).split())
+        elif tag == "a" and self._anchor is not None:
+            href, parts = self._anchor
+            self._anchor = None
+            url = urljoin(self.url, href)
+            if url.startswith(("http://", "https://")):
+                self.links.append((url, " ".join("".join(parts).split()).lower()))
+
+        if tag in TEXT_TAGS and self._text_depth:
+            self._flush_block()
+            self._text_depth -= 1
+        if tag == "p" and self._paragraph is not None:
+            self._paragraph_depth -= 1
+            if self._paragraph_depth == 0:
+                self.paragraphs.append(" ".join("".join(self._paragraph).split()))
+                self._paragraph = None
+
+    def _flush_block(self):
+        if not self._block:
+            return
+        block = " ".join("".join(self._block).split())
+        self._block = []
+        if len(block) > MIN_BLOCK_CHARS:
+            self.blocks.append(block)
+            self._text_chars += len(block) + 1
+
+    def _is_done(self):
+        if self.want_links:
+            return False
+        if self.want_text and self._text_chars < MAX_TEXT_CHARS:
+            return False
+        # The title is in <head>, long before the paragraphs
+        if self.want_company and len(self.paragraphs) < COMPANY_PARAGRAPHS:
+            return False
+        return True
+
+class _StdlibParser(HTMLParser):
+    """html.parser front end for _Collector."""
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+        if tag not in VOID_TAGS:
+            self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+def _backend():
+    if BACKEND == "html.parser" or lxml_etree is None:
+        return "html.parser"
+    return "lxml"
+
+def _chunks(content, encoding):
+    """Decodes bytes incrementally, FEED_CHARS at a time, so an early stop skips decoding the rest."""
+    if isinstance(content, str):
+        for i in range(0, len(content), FEED_CHARS):
+            yield content[i:i + FEED_CHARS]
+        return
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for i in range(0, len(content), FEED_CHARS):
+        yield decoder.decode(content[i:i + FEED_CHARS])
+    yield decoder.decode(b"", final=True)
+
+def extract(content, url, encoding=None, text=True, links=True, company=True):
+    """
+    Extracts what the scrapers need from an HTML page in a single streaming pass.
+
+    Args:
+        content (bytes or str): The page, usually FetchResult.content (already size capped).
+        url (str): Page URL, used to resolve links.
+        encoding (str): Encoding of content when it is bytes. Defaults to UTF-8.
+        text, links, company (bool): Which parts to collect. Parsing stops as soon as the
+            requested parts are complete; links need the whole page.
+
+    Returns:
+        PageContent
+    """
+    collector = _Collector(url, text, links, company)
+    if _backend() == "lxml":
+        parser = lxml_etree.HTMLParser(target=collector)
+        feed, finish = parser.feed, parser.close
+    else:
+        parser = _StdlibParser(collector)
+        feed, finish = parser.feed, parser.close
+    try:
+        for chunk in _chunks(content, encoding):
+            if chunk:
+                feed(chunk)
+        finish()
+    except _Done:
+        pass
+    collector.close()
+    return PageContent(url, collector.title, collector.blocks, collector.paragraphs, collector.links)
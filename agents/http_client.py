@@ -0,0 +1,217 @@
+# agents/http_client.py
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+import requests
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from agents.metrics import span
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+PAGE_TTL_SECONDS = int(os.getenv("VC_HUNTER_PAGE_TTL_SECONDS", "86400"))  # Served without revalidation
+POOL_HOSTS = int(os.getenv("VC_HUNTER_HTTP_POOL_HOSTS", "128"))
+POOL_SIZE_PER_HOST = int(os.getenv("VC_HUNTER_HTTP_POOL_SIZE", "8"))
+USER_AGENT = os.getenv("VC_HUNTER_USER_AGENT", "Mozilla/5.0 (compatible; VCHunter/1.0)")
+MAX_PAGE_BYTES = int(os.getenv("VC_HUNTER_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+
+TRACKING_PARAMS = {"gclid", "fbclid", "mc_cid", "mc_eid", "ref"}
+
+def canonicalize_url(url):
+    """
+    Normalizes a URL for deduplication: lowercase scheme and host, no default port, fragment,
+    tracking parameters or trailing slash, and sorted query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+class FetchResult:
+    def __init__(self, url, status_code, content, encoding=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+class PageCache:
+    """
+    On-disk store of successful responses with their validators (ETag / Last-Modified).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "pages.sqlite3")
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, encoding TEXT, "
+            "content BLOB, fetched_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, encoding, content, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, encoding, content, fetched_at = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": encoding,
+            "content": content,
+            "fetched_at": fetched_at
+        }
+
+    def put(self, url, etag, last_modified, encoding, content):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, encoding, content, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, encoding, content, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+_session = None
+_page_cache = None
+_init_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _init_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE_PER_HOST)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+        return _session
+
+def get_page_cache():
+    global _page_cache
+    with _init_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
+
+def is_fresh(url, ttl=PAGE_TTL_SECONDS):
+    """True if fetch(url) would be served from the page cache without a request."""
+    cached = get_page_cache().get(url)
+    return cached is not None and time.time() - cached["fetched_at"] < ttl
+
+def read_capped(response, max_bytes):
+    """Streams at most max_bytes of a response body; a longer body is cut off and its connection dropped."""
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(READ_CHUNK_BYTES):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                logger.info(f"Truncated {response.url} at {max_bytes} bytes")
+                break
+    finally:
+        response.close()
+    return b"".join(chunks)[:max_bytes]
+
+def detect_encoding(response, content):
+    """Charset from the Content-Type header, else from a <meta charset> near the top, else UTF-8."""
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        return response.encoding
+    match = _META_CHARSET.search(content[:4096])
+    return match.group(1).decode("ascii") if match else "utf-8"
+
+def fetch(url, timeout=10, ttl=PAGE_TTL_SECONDS, max_bytes=MAX_PAGE_BYTES):
+    """
+    GETs a URL through the shared pooled session and the on-disk page cache.
+
+    The body is streamed and cut off after max_bytes, so a heavy page costs no more to download,
+    cache or parse than its first max_bytes.
+
+    Cached pages younger than ttl seconds are returned without a request; older ones are
+    revalidated with If-None-Match / If-Modified-Since and reused on 304. If the network
+    fails and a cached copy exists, the stale copy is served.
+
+    Returns:
+        FetchResult: Exposes status_code, content, text and from_cache like a requests response.
+    """
+    with span("http", "fetch") as call:
+        result = _fetch(url, timeout, ttl, max_bytes)
+        call.add(bytes=len(result.content), cache_hits=int(result.from_cache), cache_misses=int(not result.from_cache))
+        return result
+
+def _fetch(url, timeout, ttl, max_bytes):
+    cache = get_page_cache()
+    cached = cache.get(url)
+    if cached and time.time() - cached["fetched_at"] < ttl:
+        return FetchResult(url, 200, cached["content"], cached["encoding"], from_cache=True)
+
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = get_session().get(url, timeout=timeout, headers=headers, stream=True)
+        content = read_capped(response, max_bytes)
+    except requests.RequestException as e:
+        if cached:
+            logger.warning(f"Fetch failed for {url}, serving stale cached copy: {e}")
+            return FetchResult(url, 200, cached["content"], cached["encoding"], from_cache=True)
+        raise
+
+    if response.status_code == 304 and cached:
+        cache.touch(url)
+        return FetchResult(url, 200, cached["content"], cached["encoding"], from_cache=True)
+
+    encoding = detect_encoding(response, content)
+    if response.status_code == 200:
+        cache.put(
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            encoding,
+            content
+        )
+    return FetchResult(url, response.status_code, content, encoding)
@@ -0,0 +1,300 @@
+# agents/job_service.py
+
+import os
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from agents.vc_corpus import CORPUS_DIR, load_corpus
+from agents.portfolio_index import PortfolioIndex
+from agents.concurrent_vc_processor import embed_vc_records
+from agents.metrics import Metrics, run_scope
+from agents.founder_doc_reader_and_orchestrator import (
+    iter_full_pipeline,
+    iter_vc_records,
+    VC_SUMMARIZED,
+    COMPLETE
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("VC_HUNTER_JOB_WORKERS", "4"))
+MAX_FINISHED_JOBS = int(os.getenv("VC_HUNTER_MAX_FINISHED_JOBS", "64"))
+WARM_TTL_SECONDS = int(os.getenv("VC_HUNTER_WARM_TTL_SECONDS", "21600"))  # VC records rebuilt after this
+MAX_WARM_VC_LISTS = int(os.getenv("VC_HUNTER_MAX_WARM_VC_LISTS", "8"))
+CANCEL_POLL_SECONDS = 0.5
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = {DONE, FAILED, CANCELLED}
+
+class JobCancelled(Exception):
+    pass
+
+def job_key(founder_bytes, vc_urls):
+    digest = hashlib.sha256(founder_bytes)
+    digest.update("\n".join(vc_urls).encode("utf-8"))
+    return digest.hexdigest()
+
+class Job:
+    """
+    One founder analysis. Pipeline events are recorded as they arrive, so pollers can render
+    partial results (state()) while the job runs.
+    """
+
+    def __init__(self, key, founder_bytes, vc_urls):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.vc_urls = list(vc_urls)
+        self.status = QUEUED
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.watchers = 0
+        self.metrics = None
+        self.future = None
+        self._founder_bytes = founder_bytes
+        self._cancel = threading.Event()
+        self._data = {}
+        self._progress = (0, len(self.vc_urls))
+        self._lock = threading.Lock()
+
+    def state(self):
+        """Snapshot for pollers: status, progress (completed, total), stage payloads so far, error."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "progress": self._progress,
+                "data": dict(self._data),
+                "error": self.error,
+                "elapsed": (self.finished or time.time()) - (self.started or self.created)
+            }
+
+    @property
+    def results(self):
+        """The run_full_pipeline result dict once the job is done, else None."""
+        with self._lock:
+            return self._data.get(COMPLETE)
+
+    def _set_progress(self, completed, total):
+        with self._lock:
+            self._progress = (completed, total)
+
+    def _record(self, event):
+        with self._lock:
+            if event.stage == VC_SUMMARIZED:
+                self._progress = (event.completed, event.total)
+            else:
+                self._data[event.stage] = event.data
+
+    def _set_status(self, status, error=None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            if status == RUNNING:
+                self.started = time.time()
+            elif status in FINISHED:
+                self.finished = time.time()
+                self._founder_bytes = None
+
+    def __repr__(self):
+        return f"Job({self.id!r}, status={self.status!r})"
+
+class WarmVCs:
+    """
+    Embedded VC records (and their portfolio index) for one list of VC URLs, built once and shared
+    by every job over that list. VCs come from the prebuilt corpus where possible; the rest are
+    processed live a single time, however many jobs are waiting on them.
+    """
+
+    def __init__(self, vc_urls):
+        self.vc_urls = list(vc_urls)
+        self.built_at = None
+        self.completed = 0
+        self.corpus = None
+        self.future = Future()
+
+    def expired(self):
+        return self.built_at is not None and time.time() - self.built_at > WARM_TTL_SECONDS
+
+    def build(self, base_corpus):
+        try:
+            records = [None] * len(self.vc_urls)
+            for i, record in iter_vc_records(self.vc_urls, base_corpus):
+                records[i] = record
+                self.completed += 1
+            embed_vc_records(records)
+            records = [record for record in records if record is not None]
+            self.corpus = {
+                "version": base_corpus["version"] if base_corpus else None,
+                "records": records,
+                "portfolio_index": PortfolioIndex.from_vc_embeddings(records)
+            }
+            self.built_at = time.time()
+            logger.info(f"[Jobs] Warmed {len(records)} of {len(self.vc_urls)} VCs")
+            self.future.set_result(self)
+        except Exception as e:
+            self.future.set_exception(e)
+
+    @property
+    def available_urls(self):
+        """The requested URLs that were built successfully, in request order."""
+        built = {record["url"] for record in self.corpus["records"]}
+        return [url for url in self.vc_urls if url in built]
+
+class JobService:
+    """
+    In-process job queue behind the UI.
+
+    Sessions submit founder documents and poll the returned Job. A bounded worker pool runs the
+    pipeline; the VC corpus and the VC records for each URL list are loaded or built once and shared
+    by all jobs; identical submissions (same document and VC list) share one job while it is queued
+    or running, so a discarded result is recomputed on resubmit; and a job is cancelled once every
+    session watching it has cancelled.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, corpus_dir=CORPUS_DIR):
+        self.workers = workers
+        self.corpus_dir = corpus_dir
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()  # id -> Job, oldest first
+        self._by_key = {}
+        self._warm = OrderedDict()  # tuple(vc_urls) -> WarmVCs, least recently used first
+        self._lock = threading.Lock()
+
+    def submit(self, founder_bytes, vc_urls):
+        """Returns the job for this document and VC list, starting one unless an identical job is queued or running."""
+        key = job_key(founder_bytes, vc_urls)
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is not None and job.status in (QUEUED, RUNNING):
+                job.watchers += 1
+                self._jobs.move_to_end(job.id)
+                logger.info(f"[Jobs] Joined existing job {job.id} ({job.status})")
+                return job
+            job = Job(key, founder_bytes, vc_urls)
+            job.watchers = 1
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            job.future = self._pool.submit(self._run, job)
+            self._evict()
+        logger.info(f"[Jobs] Queued job {job.id} for {len(vc_urls)} VCs")
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Drops one watcher; the job is cancelled when none are left. Returns True if it was cancelled."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job.watchers = max(0, job.watchers - 1)
+            if job.watchers:
+                return False
+            job._cancel.set()
+        if job.future.cancel():
+            job._set_status(CANCELLED)
+        logger.info(f"[Jobs] Cancelled job {job.id}")
+        return True
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = dict.fromkeys((QUEUED, RUNNING, DONE, FAILED, CANCELLED), 0)
+        for job in jobs:
+            counts[job.status] += 1
+        return {"workers": self.workers, "warm_vc_lists": len(self._warm), **counts}
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job._cancel.set()
+        self._pool.shutdown(wait=True, cancel_futures=cancel)
+
+    def _evict(self):
+        # Called with the lock held; keeps live jobs and the most recent finished ones
+        finished = [job for job in self._jobs.values() if job.status in FINISHED]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    def _evict_warm(self):
+        # Called with the lock held; jobs already waiting on an evicted WarmVCs keep their reference
+        for key in [key for key, warm in self._warm.items() if warm.expired()]:
+            del self._warm[key]
+        while len(self._warm) > MAX_WARM_VC_LISTS:
+            self._warm.popitem(last=False)
+
+    def _warm_vcs(self, vc_urls, job):
+        key = tuple(vc_urls)
+        with self._lock:
+            warm = self._warm.get(key)
+            owner = warm is None or warm.expired() or warm.future.done() and warm.future.exception() is not None
+            if owner:
+                warm = self._warm[key] = WarmVCs(vc_urls)
+            self._warm.move_to_end(key)
+            self._evict_warm()
+        if owner:
+            # Built on this job's thread; a cancel of this job lets the build finish for the others
+            warm.build(load_corpus(self.corpus_dir))
+        while True:
+            if job._cancel.is_set():
+                raise JobCancelled()
+            job._set_progress(warm.completed, len(warm.vc_urls))
+            try:
+                return warm.future.result(timeout=CANCEL_POLL_SECONDS)
+            except FutureTimeoutError:
+                continue
+
+    def _run(self, job):
+        if job._cancel.is_set():
+            job._set_status(CANCELLED)
+            return
+        job.metrics = Metrics("pipeline")
+        job._set_status(RUNNING)
+        try:
+            with run_scope(job.metrics):
+                warm = self._warm_vcs(job.vc_urls, job)
+            events = iter_full_pipeline(job._founder_bytes, warm.available_urls, corpus=warm.corpus, run=job.metrics)
+            try:
+                for event in events:
+                    job._record(event)
+                    if job._cancel.is_set():
+                        raise JobCancelled()
+            finally:
+                events.close()
+            job._set_status(DONE)
+            logger.info(f"[Jobs] Job {job.id} done in {job.metrics.elapsed():.2f}s")
+        except JobCancelled:
+            job._set_status(CANCELLED)
+        except Exception as e:
+            logger.error(f"[Jobs] Job {job.id} failed", exc_info=True)
+            job._set_status(FAILED, f"{type(e).__name__}: {e}")
+        finally:
+            with self._lock:
+                self._evict()
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_job_service():
+    """The process-wide job service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = JobService()
+        return _service
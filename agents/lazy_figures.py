@@ -0,0 +1,79 @@
+# agents/lazy_figures.py
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from agents.metrics import span, bind
+
+logger = logging.getLogger(__name__)
+
+RENDER_WORKERS = int(os.getenv("VC_HUNTER_RENDER_WORKERS", "2"))
+FIGURE_CACHE_SIZE = 16
+
+_render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+def figure_key(kind, *parts):
+    """Stable cache key for a figure built from the given parts (versions, labels, ...)."""
+    digest = hashlib.sha256(kind.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return f"{kind}:{digest.hexdigest()[:16]}"
+
+def _render(key, builder):
+    with span("render", key.split(":")[0]):
+        return builder()
+
+class LazyFigure:
+    """
+    A figure that is only built when first viewed.
+
+    The builder runs on a shared background render pool, and the resulting future is cached by key,
+    so every session asking for the same figure shares one build.
+    """
+    __slots__ = ("key", "_builder")
+
+    def __init__(self, key, builder):
+        self.key = key
+        # Bound to the creating context, so the render is attributed to the run that made the figure
+        self._builder = bind(lambda: _render(key, builder))
+
+    def prefetch(self):
+        """Starts (or joins) the background build and returns its future."""
+        with _figures_lock:
+            future = _figures.get(self.key)
+            if future is not None:
+                _figures.move_to_end(self.key)
+                return future
+            future = _render_pool.submit(self._build)
+            _figures[self.key] = future
+            if len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+            return future
+
+    def _build(self):
+        try:
+            figure = self._builder()
+            logger.info(f"[Visuals] Rendered {self.key}")
+            return figure
+        except Exception:
+            # Don't cache failures, the next view retries
+            with _figures_lock:
+                _figures.pop(self.key, None)
+            raise
+
+    def done(self):
+        with _figures_lock:
+            future = _figures.get(self.key)
+        return future is not None and future.done()
+
+    def result(self, timeout=None):
+        return self.prefetch().result(timeout)
+
+    def __repr__(self):
+        return f"LazyFigure({self.key!r})"
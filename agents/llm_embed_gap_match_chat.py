@@ -1,48 +1,67 @@
 import os
 import logging
-import time
-from openai import OpenAI
+from agents.openai_client import get_client
 from agents.utils import safe_truncate_text
+from agents.token_budget import truncate_to_budget
+from agents.embedding_cache import cached_embedding
+from agents.completion_cache import cached_chat_completion, cached_chat_completion_stream
+from agents.chat_index import get_chat_index, prefetch_chat_index as _prefetch_chat_index
+from agents.openai_scheduler import INTERACTIVE, BATCH, scheduled_embeddings
+from agents.vc_matcher import VCMatcher
 
 logger = logging.getLogger(__name__)
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 CHAT_MODEL = os.getenv("VC_HUNTER_CHAT_MODEL", "gpt-4")
 EMBED_MODEL = os.getenv("VC_HUNTER_EMBED_MODEL", "text-embedding-ada-002")
 
 MAX_INPUT_TOKENS = 8000  # conservative for 16k model
 
 def generate_founder_summary(text):
-    safe_text = safe_truncate_text(text, max_tokens=MAX_INPUT_TOKENS)
-    logger.info(f"[Founder Summary] Truncated token count: ~{len(safe_text) // 4} tokens")
+    summary = summarize_founder(text)
+    embed = generate_embedding(summary)
+    return summary, embed
 
-    response = client.chat.completions.create(
+def summarize_founder(text, priority=INTERACTIVE):
+    safe_text, token_count = truncate_to_budget(text, MAX_INPUT_TOKENS)
+    logger.info(f"[Founder Summary] Truncated token count: {token_count} tokens")
+
+    content = cached_chat_completion(
+        get_client(),
         model=CHAT_MODEL,
-        messages=[{"role": "user", "content": f"Summarize this founder document:\n\n{safe_text}"}]
+        messages=[{"role": "user", "content": f"Summarize this founder document:\n\n{safe_text}"}],
+        priority=priority
     )
-    summary = response.choices[0].message.content.strip()
-    time.sleep(1)
+    return content.strip()
+
+def generate_vc_summary(vc_url, scraped_text, portfolio_info):
+    summary = summarize_vc(vc_url, scraped_text, portfolio_info)
     embed = generate_embedding(summary)
     return summary, embed
 
-def generate_vc_summary(vc_url, scraped_text, portfolio_info):
+def summarize_vc(vc_url, scraped_text, portfolio_info):
     formatted_portfolio = ", ".join([f"{item['name']}: {item['description']}" for item in portfolio_info])
     combined = f"Website: {vc_url}\n\nDescription:\n{scraped_text}\n\nPortfolio:\n{formatted_portfolio}"
-    safe_combined = safe_truncate_text(combined, max_tokens=MAX_INPUT_TOKENS)
-    logger.info(f"[VC Summary] Truncated token count: ~{len(safe_combined) // 4} tokens")
+    safe_combined, token_count = truncate_to_budget(combined, MAX_INPUT_TOKENS)
+    logger.info(f"[VC Summary] Truncated token count: {token_count} tokens")
 
-    response = client.chat.completions.create(
+    content = cached_chat_completion(
+        get_client(),
         model=CHAT_MODEL,
-        messages=[{"role": "user", "content": f"Summarize this VC firm:\n\n{safe_combined}"}]
+        messages=[{"role": "user", "content": f"Summarize this VC firm:\n\n{safe_combined}"}],
+        priority=BATCH
     )
-    summary = response.choices[0].message.content.strip()
-    embed = generate_embedding(summary)
-    return summary, embed
+    return content.strip()
 
 def generate_embedding(text):
-    response = client.embeddings.create(
-        input=[safe_truncate_text(text, max_tokens=7500)],
-        model=EMBED_MODEL
+    return cached_embedding(text, EMBED_MODEL, _embed_uncached)
+
+def _embed_uncached(text):
+    # Single-text embeddings are the founder's, on the interactive path; VCs go through BatchEmbedder
+    response = scheduled_embeddings(
+        get_client(),
+        EMBED_MODEL,
+        [safe_truncate_text(text, max_tokens=7500)],
+        priority=INTERACTIVE
     )
     return response.data[0].embedding
 
@@ -51,56 +70,78 @@ def cosine_similarity(vec1, vec2):
     from numpy.linalg import norm
     return dot(vec1, vec2) / (norm(vec1) * norm(vec2))
 
-def match_founder_to_vcs(founder_embedding, vc_embeddings, vc_summaries):
-    matches = []
-    for vc in vc_embeddings:
-        if isinstance(vc, dict) and "embedding" in vc and "url" in vc:
-            score = cosine_similarity(founder_embedding, vc["embedding"])
-            vc_summary = next((s['summary'] for s in vc_summaries if s['url'] == vc['url']), "No summary available.")
-            matches.append({
-                "vc_url": vc["url"],
-                "score": round(score, 4),
-                "why_match": vc_summary,
-                "messaging_advice": f"Emphasize alignment with {vc_summary.split('.')[0]}."
-            })
-        else:
-            logger.warning(f"Skipping malformed VC entry: {vc}")
-    return sorted(matches, key=lambda x: x["score"], reverse=True)
+def match_founder_to_vcs(founder_embedding, vc_embeddings, vc_summaries, top_k=None):
+    """vc_embeddings may be a list of VC dicts, an EmbeddingMatrix or a prebuilt VCMatcher."""
+    matcher = vc_embeddings if isinstance(vc_embeddings, VCMatcher) else VCMatcher(vc_embeddings, vc_summaries)
+    return matcher.to_matches(matcher.score(founder_embedding, top_k))
+
+def match_founders_to_vcs(founder_embeddings, vc_embeddings, vc_summaries, top_k=None):
+    """Batch variant of match_founder_to_vcs: one list of matches per founder embedding."""
+    matcher = vc_embeddings if isinstance(vc_embeddings, VCMatcher) else VCMatcher(vc_embeddings, vc_summaries)
+    return [matcher.to_matches(scored) for scored in matcher.score_batch(founder_embeddings, top_k)]
 
 def analyze_gap(founder_summary, vc_summaries):
     joined_vcs = "\n\n".join(vc_summaries)
     combined = f"Founder Summary:\n{founder_summary}\n\nVC Summaries:\n{joined_vcs}"
-    safe_combined = safe_truncate_text(combined, max_tokens=MAX_INPUT_TOKENS)
-    logger.info(f"[Gap Analysis] Combined prompt truncated to ~{len(safe_combined) // 4} tokens")
+    safe_combined, token_count = truncate_to_budget(combined, MAX_INPUT_TOKENS)
+    logger.info(f"[Gap Analysis] Combined prompt truncated to {token_count} tokens")
 
-    response = client.chat.completions.create(
+    content = cached_chat_completion(
+        get_client(),
         model=CHAT_MODEL,
         messages=[{"role": "user", "content": 
                    "Given the following founder's summary and the summaries of various VCs, "
                    "analyze the whitespace or mismatch in themes or focus areas. Highlight any unmet needs or gaps.\n\n"
-                   + safe_combined}]
+                   + safe_combined}],
+        priority=INTERACTIVE
     )
-    return response.choices[0].message.content.strip()
+    return content.strip()
+
+def chat_messages(query, context_block):
+    prompt = f"""
+You are a VC landscape assistant. A founder uploaded their business summary and we extracted summaries of top VCs.
+
+Context:
+{context_block}
+
+Question:
+{query}
+
+Answer clearly and concisely using the context above.
+"""
+    safe_prompt, token_count = truncate_to_budget(prompt, MAX_INPUT_TOKENS)
+    logger.info(f"[Chatbot] Prompt length after truncation: {token_count} tokens")
+    return [{"role": "user", "content": safe_prompt}]
+
+def prefetch_chat_index(vc_records):
+    """Starts indexing the VC corpus for chat in the background, so the first question doesn't wait on it."""
+    return _prefetch_chat_index(vc_records, get_client(), EMBED_MODEL)
+
+def build_chat_context(query, founder_summary, vc_records):
+    """Founder summary plus the VC chunks most relevant to query, within the chat context budget."""
+    index = get_chat_index(vc_records, get_client(), EMBED_MODEL)
+    chunks = index.retrieve(generate_embedding(query))
+    logger.info(f"[Chatbot] Retrieved {len(chunks)} of {len(index)} chunks")
+    excerpts = "\n\n".join(chunk.render() for chunk in chunks)
+    return f"Founder Summary:\n{founder_summary}\n\nRelevant VC Excerpts:\n\n{excerpts}"
+
+def answer_with_context(query, context_block):
+    content = cached_chat_completion(
+        get_client(),
+        model=CHAT_MODEL,
+        messages=chat_messages(query, context_block),
+        priority=INTERACTIVE
+    )
+    return content.strip()
 
 def generate_chatbot_response(query, founder_summary, vc_summaries):
-    context = generate_chat_context(founder_summary, vc_summaries, [])
-    prompt = f"{context}\n\nUser question: {query}"
-    safe_prompt = safe_truncate_text(prompt, max_tokens=MAX_INPUT_TOKENS)
-    logger.info(f"[Chatbot] Prompt length after truncation: ~{len(safe_prompt) // 4} tokens")
+    # vc_summaries: VCRecords, corpus records, or {url, summary} dicts; richer records retrieve more
+    return answer_with_context(query, build_chat_context(query, founder_summary, vc_summaries))
 
-    response = client.chat.completions.create(
-        model=CHAT_MODEL,
-        messages=[{"role": "user", "content": safe_prompt}]
-    )
-    return response.choices[0].message.content.strip()
-
-def generate_chat_context(founder_summary, vc_summaries, matches):
-    context = f"Founder Summary:\n{founder_summary}\n\nTop VC Matches:"
-    for m in matches[:3]:
-        vc = next((v for v in vc_summaries if v['url'] == m['vc_url']), None)
-        if vc:
-            context += f"\n- {vc['url']}: {vc['summary']}"
-    return context
+def stream_chatbot_response(query, founder_summary, vc_summaries):
+    """Like generate_chatbot_response, but yields the answer in pieces as it is generated."""
+    messages = chat_messages(query, build_chat_context(query, founder_summary, vc_summaries))
+    return cached_chat_completion_stream(get_client(), CHAT_MODEL, messages, priority=INTERACTIVE)
 
 def load_or_generate_embeddings(entities, embedding_type, generate_func):
     results = []
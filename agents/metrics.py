@@ -0,0 +1,201 @@
+# agents/metrics.py
+
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Numeric fields a span can accumulate besides its duration
+FIELDS = ("bytes", "tokens", "cache_hits", "cache_misses", "retries", "errors")
+
+_current_run = contextvars.ContextVar("vc_hunter_run", default=None)
+_current_span = contextvars.ContextVar("vc_hunter_span", default=None)
+
+class Span:
+    """One timed operation: a pipeline stage or an external call."""
+    __slots__ = ("kind", "name", "parent", "start", "seconds", "fields")
+
+    def __init__(self, kind, name, parent=None):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.start = time.time()
+        self.seconds = 0.0
+        self.fields = dict.fromkeys(FIELDS, 0)
+
+    def add(self, **fields):
+        for key, value in fields.items():
+            if value:
+                self.fields[key] = self.fields.get(key, 0) + value
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "parent": self.parent,
+            "start": round(self.start, 3),
+            "seconds": round(self.seconds, 4),
+            **{key: value for key, value in self.fields.items() if value}
+        }
+
+class Metrics:
+    """
+    Aggregates spans by (kind, name): count, total and max seconds, and summed fields.
+
+    A Metrics object is kept per pipeline run, and one process-wide instance (process_metrics())
+    accumulates everything for long-running exports. Safe to share across threads.
+    """
+
+    def __init__(self, name="process", keep_spans=True):
+        self.name = name
+        self.keep_spans = keep_spans
+        self.started = time.time()
+        self.finished = None
+        self.spans = []
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, span):
+        with self._lock:
+            if self.keep_spans:
+                self.spans.append(span)
+            total = self._totals.get((span.kind, span.name))
+            if total is None:
+                total = self._totals[(span.kind, span.name)] = {
+                    "count": 0, "seconds": 0.0, "max_seconds": 0.0, **dict.fromkeys(FIELDS, 0)
+                }
+            total["count"] += 1
+            total["seconds"] += span.seconds
+            total["max_seconds"] = max(total["max_seconds"], span.seconds)
+            for key, value in span.fields.items():
+                total[key] = total.get(key, 0) + value
+
+    def finish(self):
+        self.finished = time.time()
+
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def summary(self):
+        """Aggregated rows, slowest total first."""
+        with self._lock:
+            rows = [
+                {"kind": kind, "name": name, **{key: round(value, 4) if isinstance(value, float) else value
+                                                for key, value in total.items()}}
+                for (kind, name), total in self._totals.items()
+            ]
+        return sorted(rows, key=lambda row: -row["seconds"])
+
+    def to_dict(self):
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        return {
+            "name": self.name,
+            "started": round(self.started, 3),
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "summary": self.summary(),
+            "spans": spans
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix="vc_hunter"):
+        """Prometheus text exposition format, one counter family per aggregated field."""
+        rows = self.summary()
+        families = [
+            ("span_count_total", "count", "Number of completed spans"),
+            ("span_seconds_total", "seconds", "Total seconds spent in spans"),
+            ("span_max_seconds", "max_seconds", "Slowest single span in seconds"),
+            *((f"span_{field}_total", field, f"Total {field.replace('_', ' ')} recorded by spans") for field in FIELDS)
+        ]
+        lines = []
+        for suffix, key, help_text in families:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {'gauge' if key == 'max_seconds' else 'counter'}")
+            for row in rows:
+                labels = f'kind="{_escape(row["kind"])}",name="{_escape(row["name"])}",run="{_escape(self.name)}"'
+                lines.append(f"{metric}{{{labels}}} {row.get(key, 0)}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+_process_metrics = Metrics("process", keep_spans=False)
+
+def process_metrics():
+    return _process_metrics
+
+def current_run():
+    return _current_run.get()
+
+@contextmanager
+def run_scope(run):
+    """Makes run the current run for this context; spans and bound executor tasks record into it."""
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            _current_run.reset(token)
+        except ValueError:
+            # Closed from another context (e.g. a generator finalized elsewhere)
+            _current_run.set(None)
+
+@contextmanager
+def span(kind, name, **fields):
+    """
+    Times the enclosed block as a span of the current run (and the process totals).
+
+    Yields the Span, so the block can add bytes, tokens, cache hits or retries to it.
+    Exceptions are counted as errors and re-raised.
+    """
+    parent = _current_span.get()
+    current = Span(kind, name, parent=f"{parent.kind}:{parent.name}" if parent else None)
+    current.add(**fields)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        current.add(errors=1)
+        raise
+    finally:
+        current.seconds = time.perf_counter() - started
+        _current_span.reset(token)
+        _record(current)
+
+def record(kind, name, seconds=0.0, **fields):
+    """Records a span that was measured elsewhere (or is just a count, e.g. cache lookups)."""
+    parent = _current_span.get()
+    current = Span(kind, name, parent=f"{parent.kind}:{parent.name}" if parent else None)
+    current.seconds = seconds
+    current.add(**fields)
+    _record(current)
+
+def _record(current):
+    _process_metrics.record(current)
+    run = _current_run.get()
+    if run is not None:
+        run.record(current)
+
+def traced(kind, name, func):
+    """Wraps func so every call is recorded as a span."""
+    def traced_call(*args, **kwargs):
+        with span(kind, name):
+            return func(*args, **kwargs)
+    return traced_call
+
+def bind(func):
+    """
+    Wraps func to run in a copy of the caller's context, so work submitted to an executor is
+    attributed to the caller's run and span. Each call gets its own copy, so the wrapper is
+    safe to use with pool.map and concurrent submits.
+    """
+    captured = contextvars.copy_context()
+
+    def run_in_context(*args, **kwargs):
+        return captured.copy().run(func, *args, **kwargs)
+    return run_in_context
@@ -0,0 +1,28 @@
+# agents/openai_client.py
+
+import os
+import threading
+from openai import OpenAI
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """The shared OpenAI client, created on first use so importing an agent needs no API key."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _client
+
+def set_client(client):
+    """
+    Replaces the shared client (e.g. with a stand-in for benchmarks); None restores the default.
+
+    Returns:
+        The previously installed client.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+        return previous
@@ -0,0 +1,207 @@
+# agents/openai_scheduler.py
+
+import os
+import time
+import heapq
+import random
+import logging
+import itertools
+import threading
+import email.utils
+import openai
+from agents.token_budget import count_tokens
+from agents.metrics import span, record
+
+logger = logging.getLogger(__name__)
+
+# Account quotas; defaults are conservative, raise them to your tier's limits
+CHAT_RPM = int(os.getenv("VC_HUNTER_CHAT_RPM", "500"))
+CHAT_TPM = int(os.getenv("VC_HUNTER_CHAT_TPM", "40000"))
+EMBED_RPM = int(os.getenv("VC_HUNTER_EMBED_RPM", "3000"))
+EMBED_TPM = int(os.getenv("VC_HUNTER_EMBED_TPM", "1000000"))
+MAX_RETRIES = int(os.getenv("VC_HUNTER_OPENAI_MAX_RETRIES", "6"))
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+DEFAULT_COMPLETION_TOKENS = 512   # Expected output size when a request sets no max_tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Lower runs first: someone is waiting on interactive calls, batch calls can queue
+INTERACTIVE = 0
+BATCH = 1
+
+CHAT = "chat"
+EMBEDDINGS = "embeddings"
+
+class TokenBucket:
+    """Refills continuously at capacity per minute; may go negative when usage is settled late."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        self._refill(now)
+        amount = min(amount, self.capacity)  # A request larger than the quota only needs a full bucket
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def consume(self, amount):
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+class OpenAIScheduler:
+    """
+    Admits OpenAI requests under requests-per-minute and tokens-per-minute token buckets.
+
+    Waiting requests are served strictly by (priority, arrival), so interactive calls overtake
+    queued batch calls. Rate-limit and transient errors are retried with full-jitter exponential
+    backoff, honoring Retry-After; a 429 also pauses every queued request until the server's
+    retry time so the whole process backs off together.
+    """
+
+    def __init__(self, name, rpm, tpm):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.retries = 0
+        self.throttled = 0
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+    def acquire(self, tokens, priority=BATCH):
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            self._cond.notify_all()  # A more urgent ticket may displace the current head
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._waiting[0] == ticket:
+                        delay = max(
+                            self._paused_until - now,
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(tokens, now)
+                        )
+                        if delay <= 0:
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            return
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def settle(self, estimated, actual):
+        """Corrects the token bucket once a response reports its real usage."""
+        if actual is None:
+            return
+        with self._cond:
+            self.tokens.adjust(estimated - actual)
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def run(self, func, tokens, priority=BATCH):
+        """Calls func() once admitted, retrying rate-limit and transient errors."""
+        with span("openai", self.name) as call:
+            for attempt in range(MAX_RETRIES + 1):
+                queued = time.perf_counter()
+                self.acquire(tokens, priority)
+                record("openai_queue", self.name, seconds=time.perf_counter() - queued)
+                try:
+                    response = func()
+                except Exception as e:
+                    if attempt >= MAX_RETRIES or not _is_retryable(e):
+                        raise
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt))
+                    if isinstance(e, openai.RateLimitError):
+                        self.throttled += 1
+                        self.pause(delay)
+                    self.retries += 1
+                    call.add(retries=1)
+                    logger.warning(
+                        f"[OpenAI Scheduler] {self.name} call failed ({type(e).__name__}), "
+                        f"retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                    continue
+                actual = getattr(getattr(response, "usage", None), "total_tokens", None)
+                self.settle(tokens, actual)
+                call.add(tokens=actual if actual is not None else tokens)
+                return response
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queued": len(self._waiting),
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "request_budget": round(self.requests.level, 1),
+                "token_budget": round(self.tokens.level, 1)
+            }
+
+def _is_retryable(error):
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+def get_scheduler(kind=CHAT):
+    with _schedulers_lock:
+        if kind not in _schedulers:
+            rpm, tpm = (EMBED_RPM, EMBED_TPM) if kind == EMBEDDINGS else (CHAT_RPM, CHAT_TPM)
+            _schedulers[kind] = OpenAIScheduler(kind, rpm, tpm)
+        return _schedulers[kind]
+
+def estimate_chat_tokens(messages, max_tokens=None):
+    """Prompt tokens plus the expected completion size, used to charge the TPM bucket up front."""
+    prompt = sum(count_tokens(m.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for m in messages)
+    return prompt + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+def scheduled_chat_completion(client, model, messages, priority=BATCH, **params):
+    tokens = estimate_chat_tokens(messages, params.get("max_tokens"))
+    # The scheduler owns retries, so the client's own retry loop is turned off
+    create = client.with_options(max_retries=0).chat.completions.create
+    return get_scheduler(CHAT).run(lambda: create(model=model, messages=messages, **params), tokens, priority)
+
+def scheduled_embeddings(client, model, inputs, tokens=None, priority=BATCH):
+    if tokens is None:
+        tokens = sum(count_tokens(text) for text in inputs)
+    create = client.with_options(max_retries=0).embeddings.create
+    return get_scheduler(EMBEDDINGS).run(lambda: create(input=inputs, model=model), tokens, priority)
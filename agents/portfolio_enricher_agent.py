@@ -1,41 +1,53 @@
 
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+from agents.http_client import fetch
+from agents.html_extract import extract
+from agents.openai_client import get_client
 import os
+from agents.embedding_cache import cached_embedding
+from agents.batch_embedder import BatchEmbedder
+from agents.openai_scheduler import scheduled_embeddings
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 EMBED_MODEL = os.getenv("VC_HUNTER_EMBED_MODEL", "text-embedding-ada-002")
 
 def enrich_portfolio_data(portfolio_urls):
-    enriched = []
+    enriched = fetch_portfolio_pages(portfolio_urls)
+    embed_portfolio_items(enriched)
+    return enriched
+
+def fetch_portfolio_pages(portfolio_urls):
+    pages = []
     for url in portfolio_urls:
         try:
-            response = requests.get(url, timeout=10)
+            response = fetch(url, timeout=10)
             if response.status_code != 200:
                 continue
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            title = soup.title.string.strip() if soup.title else "Unknown Company"
-            paras = soup.find_all("p")
-            text = " ".join(p.get_text() for p in paras[:3])  # Limit to top 3 paragraphs
-
-            cleaned = text.strip().replace("\n", " ")[:1000] or "No content extracted"
-            embedding = generate_embedding(cleaned)
-            enriched.append({
-                "name": title,
-                "description": cleaned,
-                "embedding": embedding
-            })
+            page = extract(response.content, url, response.encoding, text=False, links=False)
+            pages.append(company_entry(page))
 
         except Exception:
             continue
 
-    return enriched
+    return pages
+
+def company_entry(page):
+    """Portfolio entry for an extracted company page: its title and first paragraphs."""
+    return {
+        "name": page.title or "Unknown Company",
+        "description": page.description or "No content extracted",
+        "url": page.url
+    }
+
+def embed_portfolio_items(items):
+    embedder = BatchEmbedder(get_client(), EMBED_MODEL)
+    for i, item in enumerate(items):
+        embedder.add(i, item["description"])
+    for i, embedding in embedder.flush().items():
+        items[i]["embedding"] = embedding
+    return items
 
 def generate_embedding(text):
-    response = client.embeddings.create(
-        input=[text],
-        model=EMBED_MODEL
-    )
+    return cached_embedding(text, EMBED_MODEL, _embed_uncached)
+
+def _embed_uncached(text):
+    response = scheduled_embeddings(get_client(), EMBED_MODEL, [text])
     return response.data[0].embedding
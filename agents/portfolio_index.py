@@ -0,0 +1,154 @@
+# agents/portfolio_index.py
+
+import os
+import json
+import logging
+import numpy as np
+from agents.vc_matcher import normalize_rows, top_k_indices
+from agents.embedding_store import EmbeddingMatrix
+
+logger = logging.getLogger(__name__)
+
+MATRIX_FILE = "portfolio_index.npy"
+METADATA_FILE = "portfolio_index.json"
+
+def company_key(company):
+    url = company.get("url")
+    if url:
+        return url.rstrip("/").lower()
+    return f"{company.get('name', '').strip().lower()}|{company.get('description', '').strip()}"
+
+class PortfolioIndex:
+    """
+    Vector index over every portfolio company in the corpus.
+
+    Companies backed by several VCs are stored once, with all their VCs attached. Vectors
+    live in a normalized float32 matrix that can be saved as .npy and memory-mapped back.
+    """
+
+    def __init__(self, matrix, names, descriptions, urls, vcs):
+        self.matrix = matrix
+        self.names = names
+        self.descriptions = descriptions
+        self.urls = urls
+        self.vcs = vcs
+        self._rows_by_vc = {}
+        for row, backers in enumerate(vcs):
+            for vc in backers:
+                self._rows_by_vc.setdefault(vc, []).append(row)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_vc_embeddings(cls, vc_embeddings):
+        rows = {}
+        vectors, names, descriptions, urls, vcs = [], [], [], [], []
+        if isinstance(vc_embeddings, EmbeddingMatrix):
+            portfolios = [(record.url, record.portfolio) for record in vc_embeddings]
+        else:
+            portfolios = [(vc.get("url", "Unknown VC"), vc.get("portfolio", [])) for vc in vc_embeddings]
+
+        for vc_url, portfolio in portfolios:
+            for company in portfolio:
+                embedding = company.get("embedding")
+                if embedding is None or len(embedding) == 0:
+                    continue
+                key = company_key(company)
+                if key in rows:
+                    if vc_url not in vcs[rows[key]]:
+                        vcs[rows[key]].append(vc_url)
+                    continue
+                rows[key] = len(names)
+                vectors.append(embedding)
+                names.append(company.get("name", "Unknown Company"))
+                descriptions.append(company.get("description", "No description available."))
+                urls.append(company.get("url", ""))
+                vcs.append([vc_url])
+
+        if vectors:
+            matrix = normalize_rows(np.array(vectors, dtype=np.float32).reshape(len(vectors), -1))
+        else:
+            # No VC has an embedded portfolio company; queries on an empty index return []
+            matrix = np.empty((0, 0), dtype=np.float32)
+        return cls(matrix, names, descriptions, urls, vcs)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        matrix_tmp = os.path.join(directory, MATRIX_FILE + ".tmp")
+        with open(matrix_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        metadata_tmp = os.path.join(directory, METADATA_FILE + ".tmp")
+        with open(metadata_tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "names": self.names,
+                "descriptions": self.descriptions,
+                "urls": self.urls,
+                "vcs": self.vcs
+            }, f, ensure_ascii=False)
+        os.replace(matrix_tmp, os.path.join(directory, MATRIX_FILE))
+        os.replace(metadata_tmp, os.path.join(directory, METADATA_FILE))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        matrix_path = os.path.join(directory, MATRIX_FILE)
+        metadata_path = os.path.join(directory, METADATA_FILE)
+        if not (os.path.exists(matrix_path) and os.path.exists(metadata_path)):
+            return None
+        matrix = np.load(matrix_path, mmap_mode="r" if mmap else None)
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+        return cls(matrix, metadata["names"], metadata["descriptions"], metadata["urls"], metadata["vcs"])
+
+    def query(self, embedding, top_k=10, threshold=0.75, vc_filter=None):
+        """
+        Args:
+            embedding (array-like): Query vector, e.g. the founder's embedding.
+            top_k (int): Max companies to return; all above threshold when None.
+            threshold (float): Minimum cosine similarity.
+            vc_filter (iterable of str): Only consider companies backed by these VCs.
+
+        Returns:
+            list of dicts with 'name', 'description', 'url', 'vc', 'vcs' and 'score', best first.
+        """
+        return self.query_batch([embedding], top_k, threshold, vc_filter)[0]
+
+    def query_batch(self, embeddings, top_k=10, threshold=0.75, vc_filter=None):
+        """Batch variant of query: one matrix product for all query vectors, one result list per vector."""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if len(self) == 0:
+            return [[] for _ in range(len(embeddings))]
+
+        if vc_filter is not None:
+            allowed = set(vc_filter)
+            rows = np.array(sorted({row for vc in allowed for row in self._rows_by_vc.get(vc, [])}), dtype=np.int64)
+            if rows.size == 0:
+                return [[] for _ in range(len(embeddings))]
+            candidates = self.matrix[rows]
+        else:
+            allowed = None
+            rows = None
+            candidates = self.matrix
+
+        all_scores = normalize_rows(embeddings) @ candidates.T
+        return [self._results(scores, rows, allowed, top_k, threshold) for scores in all_scores]
+
+    def _results(self, scores, rows, allowed, top_k, threshold):
+        keep = np.flatnonzero(scores >= threshold)
+        if keep.size == 0:
+            return []
+        order = keep[top_k_indices(scores[keep], top_k)]
+
+        results = []
+        for i in order:
+            row = int(rows[i]) if rows is not None else int(i)
+            backers = [vc for vc in self.vcs[row] if allowed is None or vc in allowed]
+            results.append({
+                "name": self.names[row],
+                "description": self.descriptions[row],
+                "url": self.urls[row],
+                "vc": ", ".join(backers),
+                "vcs": backers,
+                "score": round(float(scores[i]), 4)
+            })
+        return results
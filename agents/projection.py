@@ -0,0 +1,195 @@
+# agents/projection.py
+
+import os
+import hashlib
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+PROJECTION_MODE = os.getenv("VC_HUNTER_PROJECTION_MODE", "pca")  # "pca" or "pca_tsne"
+REDUCED_DIMS = 50          # PCA dimensions fed to t-SNE in pca_tsne mode
+NEIGHBORS = 5              # Fitted points used to place a new point in a t-SNE layout
+MAX_INCREMENTAL_FRACTION = 0.1
+MEMORY_CACHE_SIZE = 8
+
+PCA_MODE = "pca"
+PCA_TSNE_MODE = "pca_tsne"
+
+class Projection:
+    """
+    A fitted 2-D layout of a corpus that can also place new points without refitting.
+
+    In pca mode new points are projected onto the same principal axes. In pca_tsne mode they are
+    placed at the similarity-weighted mean of their nearest fitted points in the reduced space.
+    """
+
+    def __init__(self, mode, ids, coords, mean, components, reduced=None):
+        self.mode = mode
+        self.ids = list(ids)
+        self.coords = coords
+        self.mean = mean
+        self.components = components      # (k, d) principal axes
+        self.reduced = reduced            # (n, k) fitted points in PCA space, pca_tsne mode only
+        self._rows = {id_: row for row, id_ in enumerate(self.ids)}
+
+    def coords_for(self, ids):
+        return self.coords[[self._rows[id_] for id_ in ids]]
+
+    def transform(self, vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        projected = (vectors - self.mean) @ self.components.T
+        if self.mode == PCA_MODE:
+            return _pad_2d(projected)
+
+        fitted = _unit(self.reduced)
+        queries = _unit(projected)
+        similarity = queries @ fitted.T
+        k = min(NEIGHBORS, len(self.ids))
+        nearest = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        weights = np.clip(np.take_along_axis(similarity, nearest, axis=1), 1e-6, None)
+        weights /= weights.sum(axis=1, keepdims=True)
+        return np.einsum("nk,nkc->nc", weights, self.coords[nearest])
+
+    def extend(self, ids, vectors):
+        """Returns a new Projection with extra points placed out-of-sample into this layout."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        coords = np.vstack([self.coords, self.transform(vectors)])
+        reduced = None
+        if self.reduced is not None:
+            reduced = np.vstack([self.reduced, (vectors - self.mean) @ self.components.T])
+        return Projection(self.mode, self.ids + list(ids), coords, self.mean, self.components, reduced)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f, mode=self.mode, ids=np.array(self.ids), coords=self.coords, mean=self.mean,
+                components=self.components,
+                reduced=self.reduced if self.reduced is not None else np.empty((0, 0), dtype=np.float32)
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            reduced = data["reduced"]
+            return cls(
+                str(data["mode"]), data["ids"].tolist(), data["coords"], data["mean"], data["components"],
+                reduced if reduced.size else None
+            )
+
+def _unit(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _pad_2d(coords):
+    if coords.shape[1] >= 2:
+        return coords[:, :2]
+    return np.hstack([coords, np.zeros((coords.shape[0], 2 - coords.shape[1]), dtype=coords.dtype)])
+
+def fit_projection(ids, matrix, mode=PROJECTION_MODE):
+    """Fits a deterministic 2-D layout; degrades to PCA for corpora too small for t-SNE."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    n = len(ids)
+    mean = matrix.mean(axis=0) if n else np.zeros(matrix.shape[1], dtype=np.float32)
+    if n < 2:
+        return Projection(PCA_MODE, ids, np.zeros((n, 2), dtype=np.float32), mean,
+                          np.zeros((2, matrix.shape[1]), dtype=np.float32))
+
+    if mode == PCA_TSNE_MODE and n >= 4:
+        pca = PCA(n_components=min(REDUCED_DIMS, n, matrix.shape[1]), random_state=42)
+        reduced = pca.fit_transform(matrix)
+        perplexity = min(30.0, max(1.0, (n - 1) / 3))
+        tsne = TSNE(n_components=2, random_state=42, perplexity=perplexity, init="pca")
+        coords = tsne.fit_transform(reduced).astype(np.float32)
+        return Projection(PCA_TSNE_MODE, ids, coords, pca.mean_.astype(np.float32),
+                          pca.components_.astype(np.float32), reduced.astype(np.float32))
+
+    pca = PCA(n_components=min(2, n, matrix.shape[1]), random_state=42)
+    coords = _pad_2d(pca.fit_transform(matrix).astype(np.float32))
+    return Projection(PCA_MODE, ids, coords, pca.mean_.astype(np.float32), pca.components_.astype(np.float32))
+
+def corpus_fingerprint(ids, matrix):
+    digest = hashlib.sha256("\n".join(ids).encode("utf-8"))
+    digest.update(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:16]
+
+_projections = OrderedDict()
+_latest = {}
+_lock = threading.Lock()
+
+def get_projection(ids, matrix, corpus_version=None, mode=PROJECTION_MODE):
+    """
+    Returns the 2-D layout for a corpus, cached in memory and on disk by corpus version.
+
+    When the corpus only grew by a few points since the last fitted layout, the new points are
+    placed out-of-sample instead of refitting, so the existing map stays put.
+    """
+    ids = list(ids)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    version = corpus_version or corpus_fingerprint(ids, matrix)
+    key = (version, mode)
+    path = os.path.join(CACHE_DIR, "projections", f"{version}_{mode}.npz")
+
+    with _lock:
+        if key in _projections:
+            _projections.move_to_end(key)
+            return _projections[key]
+        previous = _latest.get(mode)
+
+    projection = None
+    if os.path.exists(path):
+        try:
+            projection = Projection.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached projection {path}: {e}")
+
+    if projection is None:
+        if previous is not None:
+            projection = _try_extend(previous, ids, matrix)
+        if projection is None:
+            projection = fit_projection(ids, matrix, mode)
+            logger.info(f"[Projection] Fitted {projection.mode} layout for {len(ids)} points")
+        try:
+            projection.save(path)
+        except OSError as e:
+            logger.warning(f"Could not cache projection: {e}")
+
+    with _lock:
+        _projections[key] = projection
+        if len(_projections) > MEMORY_CACHE_SIZE:
+            _projections.popitem(last=False)
+        _latest[mode] = projection
+    return projection
+
+def _try_extend(previous, ids, matrix):
+    known = set(previous.ids)
+    current = set(ids)
+    if not known <= current:
+        return None
+    new_ids = [id_ for id_ in ids if id_ not in known]
+    if not new_ids or len(new_ids) > max(1, MAX_INCREMENTAL_FRACTION * len(ids)):
+        return None
+
+    # Only valid if the points already laid out did not move in embedding space
+    rows = {id_: row for row, id_ in enumerate(ids)}
+    old_vectors = matrix[[rows[id_] for id_ in previous.ids]]
+    if previous.reduced is not None:
+        expected = previous.reduced
+        actual = (old_vectors - previous.mean) @ previous.components.T
+    else:
+        expected = previous.coords
+        actual = _pad_2d((old_vectors - previous.mean) @ previous.components.T)
+    if not np.allclose(expected, actual, atol=1e-3):
+        return None
+
+    logger.info(f"[Projection] Placed {len(new_ids)} new points into the existing layout")
+    return previous.extend(new_ids, matrix[[rows[id_] for id_ in new_ids]])
@@ -1,30 +1,155 @@
 # agents/relationship_agent.py
 
+import os
+import json
+import hashlib
+import logging
+import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from scipy import sparse
+from agents.embedding_store import EmbeddingMatrix, VCRecord
+from agents.portfolio_index import company_key
+from agents.vc_matcher import normalize_rows
 
-def build_relationship_graph(vc_embeddings, competitors):
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("VC_HUNTER_CACHE_DIR", ".vc_hunter_cache")
+COMPETITION_TOP_K = int(os.getenv("VC_HUNTER_COMPETITION_TOP_K", "5"))
+COMPETITION_THRESHOLD = float(os.getenv("VC_HUNTER_COMPETITION_THRESHOLD", "0.85"))
+SIMILARITY_BLOCK_ROWS = 1024
+
+def _urls_and_portfolios(vc_embeddings):
+    if isinstance(vc_embeddings, EmbeddingMatrix):
+        return [(record.url, record.portfolio) for record in vc_embeddings]
+    return [
+        (vc.url, vc.portfolio) if isinstance(vc, VCRecord) else (vc["url"], vc.get("portfolio", []))
+        for vc in vc_embeddings
+    ]
+
+def co_investment_counts(vc_embeddings):
+    """
+    Counts shared portfolio companies per VC pair.
+
+    Builds an inverted index (company -> VCs) as a sparse company x VC incidence matrix, so
+    the overlap matrix B^T B only touches pairs that actually share a company.
+
+    Returns:
+        dict: {(url_a, url_b): shared_company_count}
+    """
+    entries = _urls_and_portfolios(vc_embeddings)
+    urls = [url for url, _ in entries]
+    company_rows = {}
+    rows, cols = [], []
+    for col, (_, portfolio) in enumerate(entries):
+        for company in portfolio:
+            row = company_rows.setdefault(company_key(company), len(company_rows))
+            rows.append(row)
+            cols.append(col)
+    if not rows:
+        return {}
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(company_rows), len(urls))
+    )
+    incidence.data[:] = 1  # A VC listing the same company twice still counts once
+    overlap = sparse.triu(incidence.T @ incidence, k=1).tocoo()
+    return {(urls[a], urls[b]): int(count) for a, b, count in zip(overlap.row, overlap.col, overlap.data)}
+
+def competition_pairs(vc_embeddings, top_k=COMPETITION_TOP_K, threshold=COMPETITION_THRESHOLD):
+    """
+    Finds VC pairs whose embeddings are close: each VC's top_k nearest neighbours above threshold.
+
+    Returns:
+        dict: {(url_a, url_b): cosine_similarity}
+    """
+    if isinstance(vc_embeddings, EmbeddingMatrix):
+        urls, unit = vc_embeddings.ids, vc_embeddings.normalized()
+    else:
+        # Plain VCRecords carry no vectors, only embedding dicts can yield competition edges
+        valid = [vc for vc in vc_embeddings if isinstance(vc, dict) and vc.get("embedding") is not None]
+        if not valid:
+            return {}
+        urls = [vc["url"] for vc in valid]
+        unit = normalize_rows(np.array([vc["embedding"] for vc in valid], dtype=np.float32))
+
+    n = len(urls)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return {}
+
+    pairs = {}
+    for start in range(0, n, SIMILARITY_BLOCK_ROWS):
+        block = unit[start:start + SIMILARITY_BLOCK_ROWS] @ unit.T
+        block[np.arange(len(block)), np.arange(start, start + len(block))] = -np.inf  # No self edges
+        neighbours = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        for offset, row in enumerate(neighbours):
+            a = start + offset
+            for b in row:
+                score = float(block[offset, b])
+                if score >= threshold:
+                    pairs[(urls[min(a, b)], urls[max(a, b)])] = score
+    return pairs
+
+def build_relationship_graph(vc_embeddings, competitors=None, top_k=COMPETITION_TOP_K, threshold=COMPETITION_THRESHOLD):
     G = nx.Graph()
 
     # Add all VCs to the graph
-    for vc in vc_embeddings:
-        G.add_node(vc["url"])
+    for url, _ in _urls_and_portfolios(vc_embeddings):
+        G.add_node(url)
 
-    # Add co-investments as green edges
-    for entry in competitors:
+    # Co-investments (shared portfolio companies) as green edges
+    for (vc1, vc2), shared in co_investment_counts(vc_embeddings).items():
+        G.add_edge(vc1, vc2, weight=float(shared), shared=shared, type="collab")
+
+    # Competition (similar investment focus) as red edges, purple when both
+    competition = competition_pairs(vc_embeddings, top_k=top_k, threshold=threshold)
+    for entry in competitors or []:
         vc1 = entry.get("vc1") or entry.get("vc_a") or entry.get("url_a")
         vc2 = entry.get("vc2") or entry.get("vc_b") or entry.get("url_b")
-        score = entry.get("score", 1.0)
         if vc1 and vc2:
-            if G.has_edge(vc1, vc2):
-                G[vc1][vc2]["type"] = "both"
-            else:
-                G.add_edge(vc1, vc2, weight=score, type="compete")  # Default to "compete"
+            competition[(vc1, vc2)] = entry.get("score", 1.0)
+
+    for (vc1, vc2), score in competition.items():
+        if G.has_edge(vc1, vc2):
+            G[vc1][vc2]["type"] = "both"
+            G[vc1][vc2]["similarity"] = score
+        else:
+            G.add_edge(vc1, vc2, weight=score, similarity=score, type="compete")
 
     return G
 
-def plot_relationship_graph(G):
+def graph_fingerprint(G):
+    digest = hashlib.sha256()
+    for node in sorted(G.nodes):
+        digest.update(f"n:{node}\n".encode("utf-8"))
+    for u, v in sorted(tuple(sorted(edge)) for edge in G.edges):
+        digest.update(f"e:{u}|{v}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def relationship_layout(G):
+    """spring_layout positions for G, cached on disk by graph structure."""
+    path = os.path.join(CACHE_DIR, "layouts", f"relationships_{graph_fingerprint(G)}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {node: np.array(xy) for node, xy in json.load(f).items()}
+    except (OSError, ValueError):
+        pass
+
     pos = nx.spring_layout(G, seed=42, k=0.3)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({node: [float(x), float(y)] for node, (x, y) in pos.items()}, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        logger.warning(f"Could not cache relationship layout: {e}")
+    return pos
+
+def plot_relationship_graph(G, pos=None):
+    # Object-oriented Figure rather than pyplot, so concurrent sessions never share drawing state
+    pos = pos or relationship_layout(G)
     edge_colors = []
     edge_weights = []
 
@@ -37,15 +162,16 @@ def plot_relationship_graph(G):
             edge_colors.append("purple")
         edge_weights.append(data["weight"])
 
-    plt.figure(figsize=(12, 8))
-    nx.draw_networkx_nodes(G, pos, node_color="skyblue", node_size=800)
-    nx.draw_networkx_edges(G, pos, edge_color=edge_colors, width=edge_weights)
-    nx.draw_networkx_labels(G, pos, font_size=10)
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    nx.draw_networkx_nodes(G, pos, node_color="skyblue", node_size=800, ax=ax)
+    nx.draw_networkx_edges(G, pos, edge_color=edge_colors, width=edge_weights, ax=ax)
+    nx.draw_networkx_labels(G, pos, font_size=10, ax=ax)
 
     edge_labels = {(u, v): f"{d['type'][0].upper()}:{d['weight']:.2f}" for u, v, d in G.edges(data=True)}
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8)
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
 
-    plt.title("VC Co-Investment & Competition Network")
-    plt.axis("off")
-    plt.tight_layout()
-    return plt
+    ax.set_title("VC Co-Investment & Competition Network")
+    ax.axis("off")
+    fig.tight_layout()
+    return fig
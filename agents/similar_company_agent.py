@@ -1,33 +1,23 @@
 # agents/similar_company_agent.py
 
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from agents.portfolio_index import PortfolioIndex
 
-def find_similar_companies(founder_embedding, vc_embeddings, threshold=0.75):
+def find_similar_companies(founder_embedding, vc_embeddings, threshold=0.75, top_k=None, vc_filter=None):
     """
     Finds similar companies based on cosine similarity with the founder's embedding.
 
     Args:
         founder_embedding (list or np.array): The founder's semantic embedding vector.
-        vc_embeddings (list of dict): Each dict contains 'url', 'embedding', and 'portfolio'.
+        vc_embeddings (list of dict, EmbeddingMatrix or PortfolioIndex): Each dict contains 'url', 'embedding',
+            and 'portfolio'.
+            Pass a prebuilt PortfolioIndex to avoid rebuilding the company matrix per call.
         threshold (float): Similarity threshold to consider a match.
+        top_k (int): Max companies to return; all above threshold when None.
+        vc_filter (iterable of str): Only consider companies backed by these VC URLs.
 
     Returns:
-        list of dicts: Each dict contains 'name', 'description', and 'vc' firm URL.
+        list of dicts: Each dict contains 'name', 'description', 'vc' firm URL(s), 'vcs' and 'score',
+        ranked by similarity. Companies backed by several VCs appear once.
     """
-    founder_vec = np.array(founder_embedding).reshape(1, -1)
-    similar = []
-
-    for vc in vc_embeddings:
-        portfolio = vc.get("portfolio", [])
-        for company in portfolio:
-            company_embedding = company.get("embedding")
-            if company_embedding:
-                sim_score = cosine_similarity(founder_vec, [company_embedding])[0][0]
-                if sim_score >= threshold:
-                    similar.append({
-                        "name": company.get("name", "Unknown Company"),
-                        "description": company.get("description", "No description available."),
-                        "vc": vc.get("url", "Unknown VC")
-                    })
-    return similar
+    index = vc_embeddings if isinstance(vc_embeddings, PortfolioIndex) else PortfolioIndex.from_vc_embeddings(vc_embeddings)
+    return index.query(founder_embedding, top_k=top_k, threshold=threshold, vc_filter=vc_filter)
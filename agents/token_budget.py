@@ -0,0 +1,109 @@
+# agents/token_budget.py
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN_GUESS = 6   # Generous, so the first prefix usually already exceeds the budget
+BOUNDARY_MARGIN = 16        # Tokens near a prefix cut may differ from the full encoding
+MEMO_SIZE = 4096
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+def get_encoder(encoding_name=DEFAULT_ENCODING):
+    """Cached tiktoken encoder, or None if it cannot be loaded (the failure is cached too)."""
+    with _encoders_lock:
+        if encoding_name not in _encoders:
+            try:
+                import tiktoken
+                _encoders[encoding_name] = tiktoken.get_encoding(encoding_name)
+            except Exception as e:
+                logger.warning(f"Tokenizer {encoding_name} unavailable, estimating tokens from characters: {e}")
+                _encoders[encoding_name] = None
+        return _encoders[encoding_name]
+
+class _TokenCountMemo:
+    """Bounded LRU of exact token counts for texts already known to fit a budget."""
+
+    def __init__(self, max_size=MEMO_SIZE):
+        self.max_size = max_size
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+            return count
+
+    def put(self, key, count):
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            if len(self._counts) > self.max_size:
+                self._counts.popitem(last=False)
+
+_memo = _TokenCountMemo()
+
+def _memo_key(text, encoding_name):
+    return (encoding_name, len(text), hash(text))
+
+def _encode(enc, text):
+    # Treat special-token strings in scraped text as plain text instead of raising
+    return enc.encode(text, disallowed_special=())
+
+def truncate_to_budget(text, max_tokens, encoding_name=DEFAULT_ENCODING):
+    """
+    Truncates text to at most max_tokens tokens.
+
+    Only as much of the text as needed is encoded: a prefix sized from a chars-per-token guess is
+    encoded first and grown until it clearly exceeds the budget, so a long document never pays for
+    a full encode. Texts that already fit are memoized and not re-encoded on later calls.
+
+    Returns:
+        tuple: (text within budget, exact token count of that text).
+    """
+    key = _memo_key(text, encoding_name)
+    known = _memo.get(key)
+    if known is not None and known <= max_tokens:
+        return text, known
+
+    enc = get_encoder(encoding_name)
+    if enc is None:
+        truncated = text[:max_tokens * 4]
+        return truncated, len(truncated) // 4
+
+    prefix_chars = max(max_tokens * CHARS_PER_TOKEN_GUESS, 1024)
+    while True:
+        if prefix_chars >= len(text):
+            tokens = _encode(enc, text)
+            if len(tokens) <= max_tokens:
+                _memo.put(key, len(tokens))
+                return text, len(tokens)
+            break
+        tokens = _encode(enc, text[:prefix_chars])
+        if len(tokens) >= max_tokens + BOUNDARY_MARGIN:
+            break
+        prefix_chars *= 2
+
+    truncated = enc.decode(tokens[:max_tokens])
+    _memo.put(_memo_key(truncated, encoding_name), max_tokens)
+    return truncated, max_tokens
+
+def count_tokens(text, encoding_name=DEFAULT_ENCODING):
+    """Exact token count of text (memoized)."""
+    key = _memo_key(text, encoding_name)
+    known = _memo.get(key)
+    if known is not None:
+        return known
+    enc = get_encoder(encoding_name)
+    if enc is None:
+        return len(text) // 4
+    count = len(_encode(enc, text))
+    _memo.put(key, count)
+    return count
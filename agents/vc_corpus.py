@@ -0,0 +1,216 @@
+# agents/vc_corpus.py
+#
+# Offline build of the VC corpus (summaries, portfolio data, embeddings), so founder
+# runs only have to process the founder document.
+#
+#   python -m agents.vc_corpus --urls vc_urls.txt [--csv extra_vcs.csv] [--out vc_corpus]
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import numpy as np
+from agents.concurrent_vc_processor import process_vcs
+from agents.portfolio_index import PortfolioIndex
+from agents.vc_list_aggregator_agent import merge_vc_sources
+from agents.llm_embed_gap_match_chat import CHAT_MODEL, EMBED_MODEL
+
+logger = logging.getLogger(__name__)
+
+CORPUS_DIR = os.getenv("VC_HUNTER_CORPUS_DIR", "vc_corpus")
+SCHEMA_VERSION = 2  # 2: embeddings and portfolio index live in a per-version directory
+MANIFEST_FILE = "corpus.json"
+EMBEDDINGS_FILE = "embeddings.npz"
+KEEP_VERSIONS = 2  # the current version plus the one a reader may still be loading
+
+def load_vc_urls(urls_path="vc_urls.txt", csv_path=None):
+    with open(urls_path, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if csv_path:
+        with open(csv_path, "rb") as csv_file:
+            return merge_vc_sources(urls, csv_file)
+    return merge_vc_sources(urls)
+
+def corpus_version(records):
+    digest = hashlib.sha256()
+    for record in sorted(records, key=lambda r: r["url"]):
+        digest.update(record["url"].encode("utf-8"))
+        digest.update(record["content_hash"].encode("utf-8"))
+        digest.update(record["summary"].encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def save_corpus(records, corpus_dir=CORPUS_DIR):
+    """Writes records to corpus_dir as a JSON manifest plus a per-version directory of float32 matrices."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    version = corpus_version(records)
+
+    vc_matrix = np.array([record["embedding"] for record in records], dtype=np.float32)
+    portfolio_vectors, portfolio_owner = [], []
+    vcs = []
+    for i, record in enumerate(records):
+        portfolio = []
+        for company in record["portfolio"]:
+            portfolio.append({
+                "name": company["name"],
+                "description": company["description"],
+                "url": company.get("url", "")
+            })
+            portfolio_vectors.append(company["embedding"])
+            portfolio_owner.append(i)
+        vcs.append({
+            "url": record["url"],
+            "summary": record["summary"],
+            "raw_text": record.get("raw_text", ""),
+            "content_hash": record["content_hash"],
+            "portfolio": portfolio
+        })
+    dim = vc_matrix.shape[1] if len(records) else 0
+    portfolio_matrix = np.array(portfolio_vectors, dtype=np.float32).reshape(len(portfolio_vectors), dim)
+
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "version": version,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "chat_model": CHAT_MODEL,
+        "embed_model": EMBED_MODEL,
+        "vcs": vcs
+    }
+
+    # Matrices and index go into a directory named after the version, renamed into place in one
+    # step; replacing the manifest then switches readers over, so they always load a matching set
+    version_dir = os.path.join(corpus_dir, version)
+    if not os.path.isdir(version_dir):
+        staging_dir = os.path.join(corpus_dir, f".{version}.tmp-{os.getpid()}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        with open(os.path.join(staging_dir, EMBEDDINGS_FILE), "wb") as f:
+            np.savez(f, vc=vc_matrix, portfolio=portfolio_matrix, portfolio_owner=np.array(portfolio_owner, dtype=np.int32))
+        PortfolioIndex.from_vc_embeddings(records).save(staging_dir)
+        try:
+            os.rename(staging_dir, version_dir)
+        except OSError:
+            # Another build of the same version got there first; its files are identical
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    manifest_tmp = os.path.join(corpus_dir, MANIFEST_FILE + f".tmp-{os.getpid()}")
+    with open(manifest_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(manifest_tmp, os.path.join(corpus_dir, MANIFEST_FILE))
+    _prune_versions(corpus_dir, version)
+
+    logger.info(f"[VC Corpus] Saved {len(records)} VCs as version {version} to {corpus_dir}")
+    return version
+
+def _prune_versions(corpus_dir, version):
+    """Removes version directories beyond the KEEP_VERSIONS most recent, never the current one."""
+    versions = [
+        entry for entry in os.scandir(corpus_dir)
+        if entry.is_dir() and not entry.name.startswith(".") and entry.name != version
+        and os.path.exists(os.path.join(entry.path, EMBEDDINGS_FILE))
+    ]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    """
+    Loads a prebuilt corpus.
+
+    Returns:
+        dict or None: {'version', 'built_at', 'embed_model', 'records', 'portfolio_index'} where records
+        have the same shape as process_vcs output and portfolio_index is memory-mapped, or None when
+        no compatible corpus exists.
+    """
+    manifest_path = os.path.join(corpus_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("schema_version") != SCHEMA_VERSION:
+        logger.warning(f"Ignoring VC corpus with unsupported schema {manifest.get('schema_version')}")
+        return None
+    if manifest.get("embed_model") != EMBED_MODEL:
+        logger.warning(f"Ignoring VC corpus built with embedding model {manifest.get('embed_model')}")
+        return None
+
+    version_dir = os.path.join(corpus_dir, manifest["version"])
+    embeddings_path = os.path.join(version_dir, EMBEDDINGS_FILE)
+    if not os.path.exists(embeddings_path):
+        logger.warning(f"Ignoring VC corpus {manifest['version']}: its embeddings are missing")
+        return None
+    arrays = np.load(embeddings_path)
+    vc_matrix, portfolio_matrix = arrays["vc"], arrays["portfolio"]
+    records = []
+    row = 0
+    for i, vc in enumerate(manifest["vcs"]):
+        portfolio = []
+        for company in vc["portfolio"]:
+            portfolio.append({**company, "embedding": portfolio_matrix[row]})
+            row += 1
+        records.append({
+            "url": vc["url"],
+            "summary": vc["summary"],
+            "raw_text": vc["raw_text"],
+            "content_hash": vc["content_hash"],
+            "embedding": vc_matrix[i],
+            "portfolio": portfolio
+        })
+
+    return {
+        "version": manifest["version"],
+        "built_at": manifest["built_at"],
+        "embed_model": manifest["embed_model"],
+        "records": records,
+        "portfolio_index": PortfolioIndex.load(version_dir)
+    }
+
+def build_corpus(vc_urls, corpus_dir=CORPUS_DIR, refresh=True, http_workers=None, llm_workers=None):
+    """
+    Builds or incrementally refreshes the corpus for vc_urls.
+
+    With refresh=True every VC is re-scraped, but only VCs whose scraped content hash changed
+    are re-summarized and re-embedded. With refresh=False the previous corpus is not consulted.
+    """
+    previous = load_corpus(corpus_dir) if refresh else None
+    known_records = {record["url"]: record for record in previous["records"]} if previous else {}
+
+    records = process_vcs(vc_urls, http_workers=http_workers, llm_workers=llm_workers, known_records=known_records)
+    built = []
+    for url, record in zip(vc_urls, records):
+        if record is None:
+            # Keep the last good copy of a VC that failed this time round
+            if url in known_records:
+                built.append(known_records[url])
+            continue
+        built.append(record)
+
+    reused = sum(1 for record in built if known_records.get(record["url"]) is record)
+    logger.info(f"[VC Corpus] {len(built)} VCs built, {reused} unchanged and reused")
+    return save_corpus(built, corpus_dir)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the VC Hunter corpus of VC summaries and embeddings.")
+    parser.add_argument("--urls", default="vc_urls.txt", help="File with one VC URL per line")
+    parser.add_argument("--csv", default=None, help="Optional CSV of extra VC URLs (first column)")
+    parser.add_argument("--out", default=CORPUS_DIR, help="Corpus output directory")
+    parser.add_argument("--full", action="store_true", help="Re-summarize every VC instead of refreshing incrementally")
+    parser.add_argument("--http-workers", type=int, default=None)
+    parser.add_argument("--llm-workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    vc_urls = load_vc_urls(args.urls, args.csv)
+    version = build_corpus(
+        vc_urls,
+        corpus_dir=args.out,
+        refresh=not args.full,
+        http_workers=args.http_workers,
+        llm_workers=args.llm_workers
+    )
+    print(f"Built VC corpus version {version} with {len(vc_urls)} VC URLs in {args.out}")
+
+if __name__ == "__main__":
+    main()
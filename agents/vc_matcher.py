@@ -0,0 +1,93 @@
+# agents/vc_matcher.py
+
+import logging
+import numpy as np
+from agents.embedding_store import EmbeddingMatrix
+
+logger = logging.getLogger(__name__)
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores along the last axis, highest first."""
+    n = scores.shape[-1]
+    if k is None or k >= n:
+        return np.argsort(-scores, axis=-1, kind="stable")
+    part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+class VCMatcher:
+    """
+    Cosine scorer over a pre-normalized float32 matrix of VC embeddings.
+
+    Build it once per corpus and reuse it: scoring a founder is one matrix-vector product
+    plus an argpartition, and score_batch scores many founders with one matrix product.
+    """
+
+    def __init__(self, vc_embeddings, vc_summaries=None):
+        if isinstance(vc_embeddings, EmbeddingMatrix):
+            # Shares the container's cached normalized matrix, no per-VC conversion
+            self.urls = vc_embeddings.ids
+            self.matrix = vc_embeddings.normalized()
+            self.summaries = {record.url: record.summary for record in vc_embeddings if record.summary}
+        else:
+            self._init_from_dicts(vc_embeddings)
+        for entry in vc_summaries or []:
+            self.summaries[entry["url"]] = entry["summary"]
+
+    def _init_from_dicts(self, vc_embeddings):
+        valid = []
+        for vc in vc_embeddings:
+            if isinstance(vc, dict) and "embedding" in vc and "url" in vc:
+                valid.append(vc)
+            else:
+                logger.warning(f"Skipping malformed VC entry: {vc}")
+
+        self.urls = [vc["url"] for vc in valid]
+        if valid:
+            self.matrix = normalize_rows(np.array([vc["embedding"] for vc in valid], dtype=np.float32).reshape(len(valid), -1))
+        else:
+            self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.summaries = {vc["url"]: vc["summary"] for vc in valid if vc.get("summary")}
+
+    def __len__(self):
+        return len(self.urls)
+
+    def score_batch(self, founder_embeddings, top_k=None):
+        """
+        Args:
+            founder_embeddings (array-like): (n_founders, d) matrix.
+            top_k (int): Number of VCs to keep per founder; all when None.
+
+        Returns:
+            list of lists of (vc_url, score), best match first, one list per founder.
+        """
+        founders = normalize_rows(np.atleast_2d(np.asarray(founder_embeddings, dtype=np.float32)))
+        if not self.urls:
+            return [[] for _ in range(len(founders))]
+        scores = founders @ self.matrix.T
+        indices = top_k_indices(scores, top_k)
+        return [
+            [(self.urls[j], float(scores[row, j])) for j in indices[row]]
+            for row in range(len(founders))
+        ]
+
+    def score(self, founder_embedding, top_k=None):
+        return self.score_batch([founder_embedding], top_k)[0]
+
+    def to_matches(self, scored):
+        matches = []
+        for url, score in scored:
+            vc_summary = self.summaries.get(url, "No summary available.")
+            matches.append({
+                "vc_url": url,
+                "score": round(score, 4),
+                "why_match": vc_summary,
+                "messaging_advice": f"Emphasize alignment with {vc_summary.split('.')[0]}."
+            })
+        return matches
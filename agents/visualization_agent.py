@@ -1,25 +1,35 @@
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
-from sklearn.manifold import TSNE
 from scipy.spatial import ConvexHull
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
+from agents.embedding_store import EmbeddingMatrix
+from agents.projection import get_projection
 
-def generate_cluster_plot(vc_embeddings):
+def generate_cluster_plot(vc_embeddings, founder_embedding=None, corpus_version=None):
     """
-    vc_embeddings: list of dicts with keys: url, embedding, summary, cluster, theme
-    Returns: Plotly TSNE cluster visualization figure
+    vc_embeddings: EmbeddingMatrix, or list of dicts with keys: url, embedding, summary, cluster, theme
+    founder_embedding: optional vector, placed into the VC layout without refitting it
+    corpus_version: optional cache key for the layout; defaults to a fingerprint of the vectors
+    Returns: Plotly 2-D cluster visualization figure
     """
-    urls = [vc["url"] for vc in vc_embeddings]
-    vectors = np.array([vc["embedding"] for vc in vc_embeddings])
-    summaries = [vc.get("summary", "No summary") for vc in vc_embeddings]
-    clusters = [vc.get("cluster", 0) for vc in vc_embeddings]
-    themes = [vc.get("theme", "N/A") for vc in vc_embeddings]
+    if isinstance(vc_embeddings, EmbeddingMatrix):
+        urls = vc_embeddings.ids
+        vectors = vc_embeddings.as_float32()
+        summaries = [record.summary or "No summary" for record in vc_embeddings]
+        clusters = [record.cluster for record in vc_embeddings]
+        themes = [record.theme for record in vc_embeddings]
+    else:
+        urls = [vc["url"] for vc in vc_embeddings]
+        vectors = np.array([vc["embedding"] for vc in vc_embeddings])
+        summaries = [vc.get("summary", "No summary") for vc in vc_embeddings]
+        clusters = [vc.get("cluster", 0) for vc in vc_embeddings]
+        themes = [vc.get("theme", "N/A") for vc in vc_embeddings]
 
-    # Run t-SNE
-    tsne = TSNE(n_components=2, random_state=42, perplexity=5)
-    coords = tsne.fit_transform(vectors)
+    # Cached per corpus version; see agents/projection.py for the layout modes
+    projection = get_projection(urls, vectors, corpus_version=corpus_version)
+    coords = projection.coords_for(urls)
 
     df = pd.DataFrame({
         "vc_url": urls,
@@ -36,7 +46,10 @@ def generate_cluster_plot(vc_embeddings):
     for label, group in df.groupby("cluster"):
         if len(group) >= 3:
             points = group[["x", "y"]].values
-            hull = ConvexHull(points)
+            try:
+                hull = ConvexHull(points)
+            except Exception:
+                continue  # Degenerate (e.g. collinear) cluster, no boundary to draw
             hull_points = points[hull.vertices]
             hull_points = np.append(hull_points, [hull_points[0]], axis=0)
             fig.add_trace(go.Scatter(
@@ -63,6 +76,18 @@ def generate_cluster_plot(vc_embeddings):
         name="VC Firms"
     ))
 
+    if founder_embedding is not None:
+        founder_xy = projection.transform(founder_embedding)[0]
+        fig.add_trace(go.Scatter(
+            x=[founder_xy[0]],
+            y=[founder_xy[1]],
+            mode="markers",
+            marker=dict(size=16, symbol="star", color="crimson"),
+            text=["Your startup"],
+            hoverinfo="text",
+            name="Your startup"
+        ))
+
     fig.update_layout(title="VC Landscape Cluster Visualization", height=600)
     return fig
 
@@ -72,8 +97,9 @@ def generate_heatmap_from_themes(theme_counts):
     Returns: Seaborn heatmap figure
     """
     theme_df = pd.DataFrame.from_dict(theme_counts, orient="index", columns=["count"]).sort_values("count", ascending=False)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(theme_df.T, cmap="YlGnBu", annot=True, fmt="d", cbar=False)
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.heatmap(theme_df.T, cmap="YlGnBu", annot=True, fmt="d", cbar=False, ax=ax)
     ax.set_title("VC Investment Theme Intensity")
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
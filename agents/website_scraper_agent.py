@@ -1,38 +1,29 @@
+import os
+from agents.http_client import fetch, canonicalize_url
+from agents.html_extract import extract
 
-import requests
-from bs4 import BeautifulSoup
+MAX_PORTFOLIO_LINKS = int(os.getenv("VC_HUNTER_MAX_PORTFOLIO_PAGES", "20"))
+PORTFOLIO_KEYWORDS = ("portfolio", "investments", "companies")
+
+def is_portfolio_link(href, anchor_text):
+    path = href.split("?", 1)[0].lower()
+    return any(keyword in anchor_text or keyword in path for keyword in PORTFOLIO_KEYWORDS)
 
 def scrape_vc_website(url):
     try:
-        response = requests.get(url, timeout=10)
+        response = fetch(url, timeout=10)
         if response.status_code != 200:
             return "", []
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        text_parts = []
-
-        for tag in soup.find_all(["p", "h1", "h2", "h3", "li"]):
-            if tag.text and len(tag.text.strip()) > 40:
-                text_parts.append(tag.text.strip())
-
-        full_text = "\n".join(text_parts)[:3000]
+        page = extract(response.content, url, response.encoding, company=False)
 
-        # Extract real portfolio links from the same domain
-        base_domain = url.split("//")[-1].split("/")[0]
-        portfolio_links = []
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            text = a.get_text().lower()
-            if "portfolio" in text or "investments" in text:
-                if href.startswith("/"):
-                    href = f"https://{base_domain}{href}"
-                elif href.startswith("http"):
-                    pass
-                else:
-                    href = f"https://{base_domain}/{href}"
-                portfolio_links.append(href)
+        # Portfolio links, deduplicated by canonical URL in page order
+        portfolio_links = {}
+        for href, anchor_text in page.links:
+            if is_portfolio_link(href, anchor_text):
+                portfolio_links.setdefault(canonicalize_url(href), href)
 
-        return full_text, list(set(portfolio_links))[:10]
+        return page.text, list(portfolio_links.values())[:MAX_PORTFOLIO_LINKS]
 
     except Exception as e:
         return "", []
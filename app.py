@@ -4,8 +4,18 @@ import streamlit as st
 import os
 import logging
 from urllib.parse import urlparse
-from agents.llm_embed_gap_match_chat import generate_chatbot_response
-from agents.founder_doc_reader_and_orchestrator import run_full_pipeline
+from agents.llm_embed_gap_match_chat import stream_chatbot_response
+from agents.metrics import process_metrics
+from agents.job_service import get_job_service, job_key, QUEUED, DONE, FAILED, CANCELLED
+from agents.founder_doc_reader_and_orchestrator import (
+    FOUNDER_SUMMARY,
+    MATCHES,
+    SIMILAR_COMPANIES,
+    GAP,
+    VISUALS
+)
+
+JOB_POLL_SECONDS = 1.0
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +35,7 @@ This app analyzes your startup's white paper and matches it with top venture cap
 """)
 
 # Founder document upload
-uploaded_file = st.file_uploader("Upload your startup white paper (PDF or text file)", type=["pdf", "txt"])
+uploaded_file = st.file_uploader("Upload your startup white paper (PDF, Word or text file)", type=["pdf", "docx", "txt"])
 
 # VC URLs: hardcoded list for now
 vc_urls = [
@@ -36,60 +46,192 @@ vc_urls = [
     "https://boldstart.vc", "https://initialized.com", "https://craftventures.com", "https://upfront.com"
 ]
 
+@st.cache_resource
+def job_service():
+    # One per server process: workers, warm VC records and jobs are shared by every session
+    return get_job_service()
+
+def render_founder_summary(founder_summary):
+    st.subheader("📌 Summary of Your Startup")
+    st.write(founder_summary)
+
+def render_matches(matches):
+    st.subheader("🔎 Top Matching VC Firms")
+    for match in matches:
+        domain = urlparse(match['vc_url']).netloc
+        st.markdown(f"**{domain}**")
+        st.markdown(f"🔗 [Website]({match['vc_url']})")
+        st.markdown(f"**Why it matches:** {match['why_match']}")
+        st.markdown("---")
+
+def render_similar_companies(similar_companies):
+    st.subheader("🧠 Similar Companies in the VC Landscape")
+    for company in similar_companies:
+        st.markdown(f"- **{company['name']}**: {company['description']}, funded by {company['vc']}")
+
+def render_visuals(visuals):
+    # Figures are LazyFigures: nothing is laid out or drawn until the user asks to see them
+    st.subheader("📊 VC Clusters and Strategic Patterns")
+    if not st.toggle("Show VC landscape visualizations", key="show_visuals"):
+        st.caption("Turn on to render the cluster map and relationship network.")
+        return
+
+    if visuals.get('clusters'):
+        with st.spinner("Rendering cluster map..."):
+            st.plotly_chart(visuals['clusters'].result(), use_container_width=True)
+    else:
+        st.warning("No cluster visualization available.")
+
+    st.subheader("🤝 VC Relationships & Competitive Dynamics")
+    if visuals.get('relationships'):
+        with st.spinner("Rendering relationship network..."):
+            st.pyplot(visuals['relationships'].result())
+    else:
+        st.warning("No relationship visualization available.")
+
+def render_gap(gap):
+    st.subheader("🌌 Gap / White Space Analysis")
+    st.markdown(gap or 'No gap analysis available.')
+
+def render_results(results):
+    render_founder_summary(results['founder_summary'])
+    render_matches(results['matches'])
+    render_similar_companies(results.get("similar_companies", []))
+    render_visuals(results['visuals'])
+    render_gap(results.get('gap'))
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def render_job(pending):
+    # Polls the shared job service once a second; sections fill in as the job's stages finish
+    job = job_service().get(pending["id"])
+    if job is None:
+        finish_job(error="The analysis is no longer available, please run it again.")
+        return
+    state = job.state()
+    data = state["data"]
+    if state["status"] == DONE:
+        st.session_state["pipeline_results"] = {"key": pending["key"], "results": job.results}
+        st.session_state["chat_history"] = []
+        logger.info(f"Pipeline job {job.id} finished in {state['elapsed']:.1f}s.")
+        finish_job()
+        return
+    if state["status"] in (FAILED, CANCELLED):
+        finish_job(error=state["error"] or f"The analysis was {state['status']}.")
+        return
+
+    if state["status"] == QUEUED:
+        st.info("Waiting for a free analysis worker...")
+        return
+
+    if FOUNDER_SUMMARY in data:
+        render_founder_summary(data[FOUNDER_SUMMARY])
+    else:
+        st.info("Summarizing your startup...")
+    if MATCHES not in data:
+        completed, total = state["progress"]
+        st.progress(completed / total if total else 0.0,
+                    text=f"Analyzed {completed} of {total} VC firms")
+        return
+    render_matches(data[MATCHES])
+    if SIMILAR_COMPANIES in data:
+        render_similar_companies(data[SIMILAR_COMPANIES])
+    if VISUALS in data:
+        render_visuals(data[VISUALS])
+    if GAP in data:
+        render_gap(data[GAP])
+    else:
+        st.info("Analyzing white space across the VC landscape...")
+
+def finish_job(error=None):
+    st.session_state.pop("pipeline_job", None)
+    if error:
+        st.session_state["pipeline_error"] = error
+    st.rerun()
+
+def render_chat(results):
+    st.subheader("💬 Chat With Your Results")
+    for turn in st.session_state.get("chat_history", []):
+        st.markdown(f"**You:** {turn['query']}")
+        st.markdown(f"**AI Response:** {turn['response']}")
+
+    with st.form("chat_form", clear_on_submit=True):
+        user_query = st.text_input("Ask about the VC landscape, fit, or competition")
+        asked = st.form_submit_button("Ask")
+    if asked and user_query:
+        st.markdown(f"**You:** {user_query}")
+        st.markdown("**AI Response:**")
+        chatbot_response = st.write_stream(stream_chatbot_response(
+            query=user_query,
+            founder_summary=results['founder_summary'],
+            vc_summaries=results.get('vc_records') or results['vc_summaries']
+        ))
+        st.session_state.setdefault("chat_history", []).append({"query": user_query, "response": chatbot_response})
+
+def render_metrics_panel(results):
+    # Optional, off by default: per-stage and per-call timings of the last run
+    with st.sidebar:
+        if not st.toggle("Show pipeline metrics", key="show_metrics"):
+            return
+        st.subheader("⏱️ Pipeline Metrics")
+        stats = job_service().stats()
+        st.caption(f"Job service: {stats['running']} running, {stats['queued']} queued on {stats['workers']} workers")
+        run = results.get("metrics") if results else None
+        if run is None:
+            st.caption("Run an analysis to see where the time goes.")
+            return
+        st.metric("Pipeline time", f"{run.elapsed():.1f}s")
+        st.dataframe(run.summary(), use_container_width=True, hide_index=True)
+        st.download_button("Download run metrics (JSON)", run.to_json(indent=2),
+                           file_name="vc_hunter_metrics.json", mime="application/json")
+        st.download_button("Download process metrics (Prometheus)", process_metrics().to_prometheus(),
+                           file_name="vc_hunter_metrics.prom", mime="text/plain")
+
 if uploaded_file is not None:
     st.success("White paper uploaded successfully.")
-    run_button = st.button("Run Analysis")
-
-    if run_button:
-        with st.spinner("Running full founder-to-VC analysis... this may take a few minutes"):
-            try:
-                founder_bytes = uploaded_file.read()
-                results = run_full_pipeline(
-                    founder_doc_bytes=founder_bytes,
-                    vc_urls=vc_urls
-                )
-                logger.info("Pipeline executed successfully.")
-
-                st.subheader("📌 Summary of Your Startup")
-                st.write(results['founder_summary'])
-
-                st.subheader("🔎 Top Matching VC Firms")
-                for match in results['matches']:
-                    domain = urlparse(match['vc_url']).netloc
-                    st.markdown(f"**{domain}**")
-                    st.markdown(f"🔗 [Website]({match['vc_url']})")
-                    st.markdown(f"**Why it matches:** {match['why_match']}")
-                    st.markdown("---")
-
-                st.subheader("🧠 Similar Companies in the VC Landscape")
-                for company in results.get("similar_companies", []):
-                    st.markdown(f"- **{company['name']}**: {company['description']}, funded by {company['vc']}")
-
-                st.subheader("📊 VC Clusters and Strategic Patterns")
-                if results['visuals'].get('clusters'):
-                    st.pyplot(results['visuals']['clusters'])
-                else:
-                    st.warning("No cluster visualization available.")
-
-                st.subheader("🤝 VC Relationships & Competitive Dynamics")
-                if results['visuals'].get('relationships'):
-                    st.pyplot(results['visuals']['relationships'])
-                else:
-                    st.warning("No relationship visualization available.")
-
-                st.subheader("🌌 Gap / White Space Analysis")
-                st.markdown(results.get('gap', 'No gap analysis available.'))
-
-                st.subheader("💬 Chat With Your Results")
-                user_query = st.text_input("Ask about the VC landscape, fit, or competition")
-                if user_query:
-                    chatbot_response = generate_chatbot_response(
-                        query=user_query,
-                        founder_summary=results['founder_summary'],
-                        vc_summaries=results['vc_summaries']
-                    )
-                    st.markdown(f"**AI Response:** {chatbot_response}")
-
-            except Exception as e:
-                logger.error(f"Error during analysis: {e}", exc_info=True)
-                st.error(f"An error occurred: {e}")
+    founder_bytes = uploaded_file.getvalue()
+    service = job_service()
+
+    # Results are kept per session so chat turns and widget changes don't rerun the pipeline
+    results_key = job_key(founder_bytes, vc_urls)
+    cached = st.session_state.get("pipeline_results")
+    results = cached["results"] if cached and cached["key"] == results_key else None
+
+    # A job still running for a previously uploaded document is no longer wanted by this session
+    pending = st.session_state.get("pipeline_job")
+    if pending is not None and pending["key"] != results_key:
+        service.cancel(pending["id"])
+        st.session_state.pop("pipeline_job", None)
+        pending = None
+
+    col_run, col_reset = st.columns([1, 5])
+    run_button = col_run.button("Run Analysis", disabled=results is not None or pending is not None)
+    if results is not None and col_reset.button("Discard cached results"):
+        st.session_state.pop("pipeline_results", None)
+        st.session_state.pop("chat_history", None)
+        st.rerun()
+    if pending is not None and col_reset.button("Cancel analysis"):
+        service.cancel(pending["id"])
+        st.session_state.pop("pipeline_job", None)
+        st.rerun()
+
+    try:
+        if run_button:
+            # Identical submissions from any session share one job while it is running
+            job = service.submit(founder_bytes, vc_urls)
+            pending = st.session_state["pipeline_job"] = {"key": results_key, "id": job.id}
+
+        error = st.session_state.pop("pipeline_error", None)
+        if results is not None:
+            render_results(results)
+        elif pending is not None:
+            render_job(pending)
+        elif error:
+            st.error(f"An error occurred: {error}")
+
+        if results is not None:
+            render_chat(results)
+        render_metrics_panel(results)
+
+    except Exception as e:
+        logger.error(f"Error during analysis: {e}", exc_info=True)
+        st.error(f"An error occurred: {e}")
@@ -0,0 +1,74 @@
+# benchmarks/fake_openai.py
+
+import time
+import hashlib
+import threading
+from collections import Counter
+from types import SimpleNamespace
+import numpy as np
+
+TOPICS = 8  # Embeddings are drawn around a few topic centers so clustering has structure to find
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+class FakeOpenAI:
+    """
+    Deterministic stand-in for the OpenAI client covering what the agents call:
+    chat.completions.create (plain and streamed), embeddings.create and with_options.
+
+    Every request sleeps for a fixed latency so concurrency and batching show up in timings the way
+    they would against the real API. Same input, same output.
+    """
+
+    def __init__(self, chat_latency=0.05, embed_latency=0.02, dim=1536, seed=0):
+        self.chat_latency = chat_latency
+        self.embed_latency = embed_latency
+        self.dim = dim
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._topics = np.random.default_rng(seed).normal(size=(TOPICS, dim)).astype(np.float32)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+        self.embeddings = SimpleNamespace(create=self._create_embeddings)
+
+    def with_options(self, **kwargs):
+        return self
+
+    def _count(self, kind, amount=1):
+        with self._lock:
+            self.calls[kind] += amount
+
+    def _completion_text(self, messages):
+        prompt = messages[-1]["content"]
+        digest = _digest(prompt).hex()[:8]
+        body = " ".join(prompt.split()[-60:])
+        return f"Synthetic completion {digest}. {body}"
+
+    def _create_completion(self, model, messages, stream=False, **params):
+        self._count("chat")
+        time.sleep(self.chat_latency)
+        content = self._completion_text(messages)
+        if stream:
+            return self._stream(content)
+        usage = SimpleNamespace(total_tokens=sum(len(m["content"]) for m in messages) // 4 + len(content) // 4)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    def _stream(self, content):
+        for word in content.split(" "):
+            delta = SimpleNamespace(content=word + " ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def embed(self, text):
+        digest = _digest(text)
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+        return self._topics[digest[8] % TOPICS] + 0.5 * rng.normal(size=self.dim).astype(np.float32)
+
+    def _create_embeddings(self, input, model, **params):
+        inputs = [input] if isinstance(input, str) else list(input)
+        self._count("embeddings")
+        self._count("embedded_texts", len(inputs))
+        time.sleep(self.embed_latency)
+        data = [SimpleNamespace(index=i, embedding=self.embed(text).tolist()) for i, text in enumerate(inputs)]
+        usage = SimpleNamespace(total_tokens=sum(len(text) for text in inputs) // 4)
+        return SimpleNamespace(data=data, usage=usage)
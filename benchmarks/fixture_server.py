@@ -0,0 +1,109 @@
+# benchmarks/fixture_server.py
+
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECTORS = [
+    "fintech infrastructure", "climate and energy", "developer tools", "healthcare AI",
+    "robotics and industrial automation", "consumer marketplaces", "cybersecurity", "biotech platforms"
+]
+
+class FixtureSite:
+    """
+    Local web server with synthetic VC home pages and portfolio company pages.
+
+    VC i lives at /vc/i and links to companies_per_vc pages at /company/j. Companies are drawn from a
+    shared pool, so VCs co-invest the way real portfolios overlap. Pages are generated per request
+    from the path, so any number of VCs costs no memory up front.
+    """
+
+    def __init__(self, n_vcs, companies_per_vc=5, seed=0):
+        self.n_vcs = n_vcs
+        self.companies_per_vc = companies_per_vc
+        self.n_companies = max(companies_per_vc, n_vcs * 3)
+        self.seed = seed
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def vc_urls(self):
+        return [f"{self.base_url}/vc/{i}" for i in range(self.n_vcs)]
+
+    def portfolio_of(self, vc):
+        rng = random.Random(self.seed * 1_000_003 + vc)
+        return rng.sample(range(self.n_companies), self.companies_per_vc)
+
+    def vc_page(self, vc):
+        sector = SECTORS[vc % len(SECTORS)]
+        paragraphs = "".join(
+            f"<p>Fund {vc} backs founders building {sector}; paragraph {k} describes our thesis, "
+            f"check sizes from seed to series B, and how we support companies after investing.</p>"
+            for k in range(6)
+        )
+        links = "".join(
+            f'<li><a href="/company/{company}">Portfolio: Company {company}</a></li>'
+            for company in self.portfolio_of(vc)
+        )
+        return f"<html><head><title>Fund {vc}</title></head><body><h1>Fund {vc}</h1>{paragraphs}<ul>{links}</ul></body></html>"
+
+    def company_page(self, company):
+        sector = SECTORS[company % len(SECTORS)]
+        paragraphs = "".join(
+            f"<p>Company {company} builds {sector} products. Detail {k} about customers, traction and team.</p>"
+            for k in range(4)
+        )
+        return f"<html><head><title>Company {company}</title></head><body>{paragraphs}</body></html>"
+
+    def render(self, path):
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[1].isdigit():
+            if parts[0] == "vc" and int(parts[1]) < self.n_vcs:
+                return self.vc_page(int(parts[1]))
+            if parts[0] == "company" and int(parts[1]) < self.n_companies:
+                return self.company_page(int(parts[1]))
+        return None
+
+    def start(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, every keep-alive
+            # response would wait ~40ms for a delayed ACK and swamp the timings
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                html = site.render(self.path)
+                body = (html or "Not found").encode("utf-8")
+                self.send_response(200 if html else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,228 @@
+# benchmarks/run_benchmarks.py
+"""
+Offline stage benchmarks for the VC Hunter pipeline.
+
+    python -m benchmarks.run_benchmarks --sizes 20 200 2000 --json results.json
+    python -m benchmarks.run_benchmarks --sizes 200 --compare results.json
+
+Every size runs in a fresh subprocess with empty cache and corpus directories, against a local
+fixture web server (benchmarks/fixture_server.py) and a fake OpenAI client with fixed latency
+(benchmarks/fake_openai.py) installed through agents.openai_client.set_client. No network access
+or API key is needed, and results are comparable run to run on the same machine.
+
+The "stages" run times each step of run_full_pipeline on its own (crawl, summarize, embed, match,
+similar, cluster, plot), with caches cold. The "pipeline" run times run_full_pipeline end to end,
+including rendering its lazy figures. Each row reports wall time, throughput in VCs per second and
+peak traced Python memory.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import resource
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_SIZES = [20, 200, 2000]
+MIN_REGRESSION_SECONDS = 0.05  # Sub-50ms stages are dominated by timer noise
+
+def _worker_env(cache_dir):
+    env = dict(os.environ)
+    env.update({
+        "VC_HUNTER_CACHE_DIR": os.path.join(cache_dir, "cache"),
+        "VC_HUNTER_CORPUS_DIR": os.path.join(cache_dir, "corpus"),
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY", "benchmark"),
+        # The fake backend has no quota; leave the scheduler's buckets out of the timings
+        "VC_HUNTER_CHAT_RPM": env.get("VC_HUNTER_CHAT_RPM", "1000000000"),
+        "VC_HUNTER_CHAT_TPM": env.get("VC_HUNTER_CHAT_TPM", "1000000000"),
+        "VC_HUNTER_EMBED_RPM": env.get("VC_HUNTER_EMBED_RPM", "1000000000"),
+        "VC_HUNTER_EMBED_TPM": env.get("VC_HUNTER_EMBED_TPM", "1000000000"),
+        # The fixture site stands in for many VC hosts on one address; no per-host politeness
+        "VC_HUNTER_CRAWL_PER_DOMAIN": env.get("VC_HUNTER_CRAWL_PER_DOMAIN", "1000"),
+        "VC_HUNTER_CRAWL_DOMAIN_DELAY": env.get("VC_HUNTER_CRAWL_DOMAIN_DELAY", "0")
+    })
+    return env
+
+class StageTimer:
+    def __init__(self, n_vcs, trace_memory):
+        self.n_vcs = n_vcs
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def run(self, name, func, *args, **kwargs):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        self.results.append({
+            "stage": name,
+            "seconds": round(seconds, 4),
+            "vcs_per_second": round(self.n_vcs / seconds, 2) if seconds > 0 else None,
+            "peak_mb": round(peak / 2 ** 20, 2) if peak is not None else None
+        })
+        return value
+
+def founder_document(n_words=3000):
+    words = "We build developer tools and fintech infrastructure for climate data teams".split()
+    return " ".join(words[i % len(words)] for i in range(n_words)).encode("utf-8")
+
+def run_stages(site, timer, http_workers, llm_workers):
+    # Imported here so the subprocess environment (cache dirs, limits) is in place first
+    from agents.crawler import crawl_vcs
+    from agents.concurrent_vc_processor import summarize_vc, embed_vc_records
+    from agents.embedding_store import EmbeddingMatrix
+    from agents.llm_embed_gap_match_chat import generate_founder_summary, match_founder_to_vcs
+    from agents.similar_company_agent import find_similar_companies
+    from agents.categorizer_agent import categorize_vcs
+    from agents.visualization_agent import generate_cluster_plot
+    from agents.relationship_agent import build_relationship_graph, plot_relationship_graph
+
+    urls = site.vc_urls
+    crawled = timer.run("crawl", crawl_vcs, urls, concurrency=http_workers)
+    with ThreadPoolExecutor(max_workers=llm_workers) as pool:
+        records = timer.run("summarize", lambda: list(pool.map(
+            summarize_vc, urls, [text for text, _ in crawled], [portfolio for _, portfolio in crawled]
+        )))
+    timer.run("embed", embed_vc_records, records)
+
+    founder_summary, founder_embedding = timer.run("founder", generate_founder_summary, founder_document().decode("utf-8"))
+    vc_embeddings = EmbeddingMatrix.from_vc_records(records)
+    vc_summaries = [{"url": vc.url, "summary": vc.summary} for vc in vc_embeddings]
+    timer.run("match", match_founder_to_vcs, founder_embedding, vc_embeddings, vc_summaries)
+    timer.run("similar", find_similar_companies, founder_embedding, vc_embeddings, top_k=20)
+
+    labels, clusters = timer.run("cluster", categorize_vcs, vc_embeddings)
+    for vc, label in zip(vc_embeddings, labels):
+        vc.cluster = label
+        vc.theme = clusters[label]["theme"]
+
+    def plot():
+        generate_cluster_plot(vc_embeddings, founder_embedding=founder_embedding)
+        plot_relationship_graph(build_relationship_graph(vc_embeddings))
+    timer.run("plot", plot)
+
+def run_pipeline(site, timer, http_workers, llm_workers):
+    from agents.founder_doc_reader_and_orchestrator import run_full_pipeline
+
+    def pipeline():
+        results = run_full_pipeline(founder_document(), site.vc_urls, http_workers=http_workers, llm_workers=llm_workers)
+        for figure in results["visuals"].values():
+            figure.result()
+        return results
+    timer.run("pipeline", pipeline)
+
+def worker(args):
+    from benchmarks.fake_openai import FakeOpenAI
+    from benchmarks.fixture_server import FixtureSite
+    from agents.openai_client import set_client
+
+    fake = FakeOpenAI(chat_latency=args.chat_latency, embed_latency=args.embed_latency, dim=args.dim)
+    set_client(fake)
+    if not args.no_memory:
+        tracemalloc.start()
+    timer = StageTimer(args.size, trace_memory=not args.no_memory)
+    with FixtureSite(args.size, companies_per_vc=args.companies_per_vc) as site:
+        if args.mode == "stages":
+            run_stages(site, timer, args.http_workers, args.llm_workers)
+        else:
+            run_pipeline(site, timer, args.http_workers, args.llm_workers)
+
+    json.dump({
+        "size": args.size,
+        "mode": args.mode,
+        "stages": timer.results,
+        "api_calls": dict(fake.calls),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }, sys.stdout)
+
+def run_size(size, mode, args):
+    command = [
+        sys.executable, "-m", "benchmarks.run_benchmarks", "--worker",
+        "--size", str(size), "--mode", mode,
+        "--chat-latency", str(args.chat_latency), "--embed-latency", str(args.embed_latency),
+        "--dim", str(args.dim), "--companies-per-vc", str(args.companies_per_vc),
+        "--http-workers", str(args.http_workers), "--llm-workers", str(args.llm_workers)
+    ]
+    if args.no_memory:
+        command.append("--no-memory")
+    with tempfile.TemporaryDirectory(prefix="vc_hunter_bench_") as tmp:
+        completed = subprocess.run(command, env=_worker_env(tmp), capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark worker failed for {size} VCs ({mode}):\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout)
+
+def print_report(runs):
+    print(f"{'VCs':>6}  {'stage':<10} {'seconds':>9} {'VCs/s':>10} {'peak MB':>9}")
+    for run in runs:
+        for row in run["stages"]:
+            peak = "-" if row["peak_mb"] is None else f"{row['peak_mb']:.1f}"
+            rate = "-" if row["vcs_per_second"] is None else f"{row['vcs_per_second']:.1f}"
+            print(f"{run['size']:>6}  {row['stage']:<10} {row['seconds']:>9.3f} {rate:>10} {peak:>9}")
+        calls = ", ".join(f"{kind}={count}" for kind, count in sorted(run["api_calls"].items()))
+        print(f"{run['size']:>6}  ({run['mode']}: max RSS {run['max_rss_mb']} MB; fake API calls: {calls})")
+
+def compare(runs, baseline_path, tolerance):
+    """Returns the stages that got slower than the baseline by more than tolerance."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (run["size"], run["mode"], row["stage"]): row["seconds"]
+            for run in json.load(f)["runs"] for row in run["stages"]
+        }
+    regressions = []
+    for run in runs:
+        for row in run["stages"]:
+            before = baseline.get((run["size"], run["mode"], row["stage"]))
+            if before and row["seconds"] > before * (1 + tolerance) and row["seconds"] - before >= MIN_REGRESSION_SECONDS:
+                regressions.append(f"{run['size']} VCs {row['stage']}: {before:.3f}s -> {row['seconds']:.3f}s")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmarks of the VC Hunter pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of VCs to benchmark")
+    parser.add_argument("--modes", nargs="+", choices=["stages", "pipeline"], default=["stages", "pipeline"])
+    parser.add_argument("--chat-latency", type=float, default=0.05, help="Seconds per fake chat completion")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Seconds per fake embeddings request")
+    parser.add_argument("--dim", type=int, default=1536, help="Fake embedding dimension")
+    parser.add_argument("--companies-per-vc", type=int, default=5)
+    parser.add_argument("--http-workers", type=int, default=8)
+    parser.add_argument("--llm-workers", type=int, default=4)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory column)")
+    parser.add_argument("--json", default=None, help="Write results to this file")
+    parser.add_argument("--compare", default=None, help="Baseline results file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="stages", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args)
+        return
+
+    runs = []
+    for size in args.sizes:
+        for mode in args.modes:
+            print(f"Benchmarking {size} VCs ({mode})...", file=sys.stderr)
+            runs.append(run_size(size, mode, args))
+    print_report(runs)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k not in ("worker", "size", "mode")}, "runs": runs}, f, indent=2)
+
+    if args.compare:
+        regressions = compare(runs, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import numpy as np
+from agents.portfolio_index import PortfolioIndex
+from agents.vc_corpus import save_corpus, load_corpus
+
+def vc_record(url, portfolio):
+    return {
+        "url": url,
+        "summary": f"Summary of {url}",
+        "content_hash": url,
+        "embedding": np.ones(4, dtype=np.float32),
+        "portfolio": portfolio
+    }
+
+def test_index_without_portfolio_companies_is_empty():
+    index = PortfolioIndex.from_vc_embeddings([vc_record("https://a.vc", []), vc_record("https://b.vc", [])])
+    assert len(index) == 0
+    assert index.query(np.ones(4)) == []
+    assert index.query_batch(np.ones((2, 4)), vc_filter=["https://a.vc"]) == [[], []]
+
+def test_corpus_without_portfolio_companies_round_trips(tmp_path):
+    save_corpus([vc_record("https://a.vc", [])], str(tmp_path))
+    corpus = load_corpus(str(tmp_path))
+    assert [record["url"] for record in corpus["records"]] == ["https://a.vc"]
+    assert corpus["portfolio_index"].query(np.ones(4)) == []